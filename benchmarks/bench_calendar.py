@@ -0,0 +1,156 @@
+"""
+캘린더 데이터 계층 벤치마크 (화면 없이 실행).
+
+합성 일정(기본 1k / 10k / 100k 건, 여러 해에 걸친 체크리스트·고정 일정 포함)을 만들어
+저장소 연산과 화면 갱신용 데이터 가공의 지연 시간과 최대 메모리를 측정합니다.
+
+    python -m benchmarks.bench_calendar
+    python -m benchmarks.bench_calendar --sizes 1000 10000 --compare benchmarks/results/이전결과.json
+
+결과는 benchmarks/results/ 아래 JSON 파일로 저장되어 실행 간 비교에 사용할 수 있습니다.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from plancalendar import event_store
+from plancalendar.alarm_scheduler import AlarmScheduler
+from plancalendar.view_model import date_colors, month_date_range, sorted_day_events, event_display_text
+from benchmarks.common import measure, load_previous, format_stats, save_results
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+COLORS = ["blue", "green", "red", "orange", "purple", "brown", "gray", "cyan", "magenta"]
+FIRST_YEAR = 2015
+YEARS = 20
+
+
+def generate_schedule(n_events, seed=0):
+    """n_events 건의 일정을 FIRST_YEAR 부터 YEARS 년에 흩어 만든 {날짜: {"events", "checklist"}} 데이터."""
+    rng = random.Random(seed)
+    start = datetime(FIRST_YEAR, 1, 1)
+    n_days = 365 * YEARS
+    data = {}
+    for i in range(n_events):
+        date_str = (start + timedelta(days=rng.randrange(n_days))).strftime("%Y-%m-%d")
+        day = data.setdefault(date_str, {"events": [], "checklist": []})
+        hour = rng.randrange(8, 22)
+        day["events"].append({
+            "title": f"일정 {i}",
+            "time": f"{hour:02d}:00 ~ {hour + 1:02d}:00" if rng.random() < 0.8 else "",
+            "color": rng.choice(COLORS),
+            "pinned": rng.random() < 0.1
+        })
+        if rng.random() < 0.5:
+            day["checklist"].append({"task": f"할 일 {i}", "done": rng.random() < 0.3})
+    return data
+
+
+def _use_store_in(directory):
+    event_store.close()
+    event_store.DB_FILE = os.path.join(directory, "schedule_data.db")
+    event_store.LEGACY_JSON_FILE = os.path.join(directory, "schedule_data.json")
+    event_store.SNAPSHOT_FILE = os.path.join(directory, "schedule_data.snapshot.db")
+
+
+def run_size(n_events, repeat):
+    data = generate_schedule(n_events)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        _use_store_in(tmp)
+        # 압축이 측정 중에 끼어들지 않도록 기준을 크게 잡습니다.
+        event_store.set_compact_threshold(10 ** 9)
+
+        t0 = time.perf_counter()
+        event_store.insert_events((d, e) for d, day in data.items() for e in day["events"])
+        for d, day in data.items():
+            for item in day["checklist"]:
+                event_store.insert_check_item(d, item)
+        results["initial_load_s"] = round(time.perf_counter() - t0, 3)
+
+        stored = event_store.load_data()
+        dates = sorted(stored)
+        rng = random.Random(1)
+        sample_date = dates[len(dates) // 2]
+        check_ids = [item["id"] for day in stored.values() for item in day["checklist"]]
+        mid = datetime.strptime(sample_date, "%Y-%m-%d")
+
+        results["load_data"] = measure(event_store.load_data, repeat)
+        results["save_data_unchanged"] = measure(lambda: event_store.save_data(stored), repeat)
+
+        def save_one_changed():
+            stored[sample_date]["events"][0]["title"] += "*"
+            event_store.save_data(stored)
+        results["save_data_one_date_changed"] = measure(save_one_changed, repeat)
+
+        # 저장소 쓰기 비용만 잽니다 (calendar_planman 의 입력 정리·항목별 결과 처리는 포함하지 않음)
+        results["insert_event"] = measure(
+            lambda: event_store.insert_event(rng.choice(dates), {"title": "추가", "time": "10:00"}), repeat)
+        batch = [(rng.choice(dates), {"title": f"일괄 {i}", "time": "18:00 ~ 20:00"}) for i in range(60)]
+        results["insert_events_60"] = measure(lambda: event_store.insert_events(batch), repeat)
+        if check_ids:
+            results["toggle_check_item"] = measure(
+                lambda: event_store.set_check_item_done(rng.choice(check_ids), True), repeat)
+
+        def refresh_day():
+            day = event_store.load_day(sample_date)
+            return [event_display_text(e) for e in sorted_day_events(day["events"])], day["checklist"]
+        results["refresh_all_prep"] = measure(refresh_day, repeat)
+
+        def month_colors():
+            visible = month_date_range(mid.year, mid.month)
+            return date_colors(event_store.load_range(visible[0], visible[-1]), visible)
+        results["update_calendar_colors_prep"] = measure(month_colors, repeat)
+
+        scheduler = AlarmScheduler(lambda title, msg: None)
+        results["alarm_window_scan"] = measure(lambda: scheduler.rebuild(mid), repeat)
+
+        # 비교용: 예전 방식(JSON 전체 파싱 / indent=2 전체 재작성)
+        legacy_path = os.path.join(tmp, "legacy.json")
+
+        def legacy_save():
+            with open(legacy_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+
+        def legacy_load():
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        results["legacy_json_save"] = measure(legacy_save, repeat)
+        results["legacy_json_load"] = measure(legacy_load, repeat)
+
+        event_store.close()
+    return results
+
+
+def print_results(all_results, previous=None):
+    for size, ops in all_results.items():
+        print(f"\n== {size} events ==")
+        print(f"  initial bulk insert: {ops['initial_load_s']} s")
+        for op, stats in ops.items():
+            if not isinstance(stats, dict):
+                continue
+            print(format_stats(op, stats, (previous or {}).get(size, {}).get(op)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plan Man 캘린더 데이터 계층 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="합성 일정 개수들")
+    parser.add_argument("--repeat", type=int, default=5, help="연산별 반복 횟수")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/calendar-<시각>.json)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 경로")
+    args = parser.parse_args(argv)
+
+    all_results = {}
+    for size in args.sizes:
+        all_results[str(size)] = run_size(size, args.repeat)
+
+    print_results(all_results, load_previous(args.compare))
+    output = save_results("calendar", all_results, args.repeat, args.output)
+    print(f"\n결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
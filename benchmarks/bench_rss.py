@@ -0,0 +1,82 @@
+"""
+RSS 파서 벤치마크: 기존 BeautifulSoup 전체 파싱과 스트리밍 조기 종료 파서를 비교합니다.
+
+fixtures/ 의 피드 파일(연합뉴스·전자신문 RSS 형식)을 사용하며, --scale 로 item 을 복제해
+더 큰 피드도 만들 수 있습니다.
+
+    python -m benchmarks.bench_rss
+    python -m benchmarks.bench_rss --scale 1 10 --compare benchmarks/results/이전결과.json
+"""
+import argparse
+import os
+import re
+
+from news.rss_stream import iter_rss_items
+from benchmarks.common import measure, load_previous, format_stats, save_results
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+LIMIT = 10
+_ITEM_RE = re.compile(rb"<item>.*?</item>\s*", re.S)
+
+
+def load_fixtures():
+    fixtures = {}
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        if name.endswith(".xml"):
+            with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+                fixtures[name] = f.read()
+    return fixtures
+
+
+def scale_feed(content, factor):
+    """item 들을 factor 배로 복제한 피드를 만듭니다."""
+    if factor == 1:
+        return content
+    items = b"".join(_ITEM_RE.findall(content))
+    head, sep, tail = content.partition(b"</channel>")
+    return head + items * (factor - 1) + sep + tail
+
+
+def parse_with_beautifulsoup(content):
+    # 예전 news_viewer 의 방식 그대로: 전체 트리를 만든 뒤 앞의 10개만 사용
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(content, "xml")
+    items = soup.find_all("item")
+    return [{"title": item.title.text.strip(), "link": item.link.text.strip()} for item in items[:LIMIT]]
+
+
+def parse_streaming(content):
+    return [{"title": item["title"], "link": item["link"]} for item in iter_rss_items(content, limit=LIMIT)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plan Man RSS 파서 벤치마크")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10], help="item 복제 배수들")
+    parser.add_argument("--repeat", type=int, default=20, help="연산별 반복 횟수")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmarks/results/rss-<시각>.json)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 경로")
+    args = parser.parse_args(argv)
+
+    previous = load_previous(args.compare) or {}
+    results = {}
+    for name, content in load_fixtures().items():
+        for factor in args.scale:
+            feed = scale_feed(content, factor)
+            key = f"{name} x{factor}"
+            if parse_streaming(feed) != parse_with_beautifulsoup(feed):
+                raise SystemExit(f"{key}: 두 파서의 결과가 다릅니다.")
+            results[key] = {
+                "size_kib": round(len(feed) / 1024, 1),
+                "beautifulsoup": measure(lambda: parse_with_beautifulsoup(feed), args.repeat),
+                "streaming": measure(lambda: parse_streaming(feed), args.repeat)
+            }
+            print(f"\n== {key} ({results[key]['size_kib']} KiB) ==")
+            for op in ("beautifulsoup", "streaming"):
+                print(format_stats(op, results[key][op], previous.get(key, {}).get(op)))
+
+    output = save_results("rss", results, args.repeat, args.output)
+    print(f"\n결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+
+# 벤치마크 공통 도구: 지연 시간/메모리 측정과 결과 파일 저장·비교
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def measure(func, repeat=5):
+    """func 을 repeat 번 실행한 지연 시간(ms)과, 한 번 실행할 때의 최대 할당 메모리(KiB)."""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - t0) * 1000)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "median_ms": round(statistics.median(times), 3),
+        "min_ms": round(min(times), 3),
+        "peak_kib": round(peak / 1024, 1)
+    }
+
+
+def load_previous(path):
+    if not path:
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("results")
+
+
+def format_stats(op, stats, prev=None):
+    line = f"  {op:<32} {stats['median_ms']:10.3f} ms (min {stats['min_ms']:.3f})  peak {stats['peak_kib']:10.1f} KiB"
+    if isinstance(prev, dict) and prev.get("median_ms"):
+        change = (stats["median_ms"] - prev["median_ms"]) / prev["median_ms"] * 100
+        line += f"  ({change:+.1f}% vs 이전)"
+    return line
+
+
+def save_results(name, results, repeat, output=None):
+    """결과를 JSON 으로 저장하고 경로를 반환합니다. (기본: benchmarks/results/<name>-<시각>.json)"""
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "benchmark": name,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "results": results
+        }, f, ensure_ascii=False, indent=2)
+    return output
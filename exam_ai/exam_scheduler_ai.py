@@ -1,16 +1,43 @@
-import google.generativeai as genai
+import json
 import os
 from datetime import datetime
 import re
 
-GOOGLE_API_KEY = os.getenv("GEMINI_API_KEY")
-if not GOOGLE_API_KEY:
-    raise ValueError("GEMINI_API_KEY 환경변수가 설정되지 않았습니다.")
+from exam_ai import plan_cache
 
-genai.configure(api_key=GOOGLE_API_KEY)
-model = genai.GenerativeModel("models/gemini-1.5-flash")
+MODEL_NAME = "models/gemini-1.5-flash"
+# 프롬프트 문구를 바꾸면 올려 주세요. 예전 프롬프트로 만든 캐시를 쓰지 않게 됩니다.
+PROMPT_VERSION = 2
+_model = None
 
-def generate_exam_plan(subjects, start_date):
+# 계획은 {date, subject, title} 항목의 JSON 배열로 받습니다 (Gemini 의 응답 스키마 제한 기능).
+PLAN_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "date": {"type": "STRING", "description": "YYYY-MM-DD"},
+            "subject": {"type": "STRING"},
+            "title": {"type": "STRING"}
+        },
+        "required": ["date", "subject", "title"]
+    }
+}
+PLAN_GENERATION_CONFIG = {"response_mime_type": "application/json", "response_schema": PLAN_SCHEMA}
+
+def get_model():
+    """Gemini 클라이언트를 처음 사용할 때 설정하고 만듭니다."""
+    global _model
+    if _model is None:
+        google_api_key = os.getenv("GEMINI_API_KEY")
+        if not google_api_key:
+            raise ValueError("GEMINI_API_KEY 환경변수가 설정되지 않았습니다.")
+        import google.generativeai as genai
+        genai.configure(api_key=google_api_key)
+        _model = genai.GenerativeModel(MODEL_NAME)
+    return _model
+
+def build_exam_prompt(subjects, start_date):
     prompt = f"""
     당신은 대학생을 위한 공부 계획 도우미입니다.
     입력된 시험 과목 정보(과목명, 시험일, 전공/교양 여부, 예상 학습량)를 기반으로,
@@ -20,7 +47,7 @@ def generate_exam_plan(subjects, start_date):
     '{start_date}' 이전의 날짜에는 어떠한 공부 계획도 배정하면 안 됩니다.
 
     시간대별이 아닌 날짜별 분배로 하며, 학습량이 많을수록 더 많은 시간을 배정하세요.
-    시험일 전날은 전범위 복습을 배정하고, 학습 계획은 보기 좋게 정리해주세요.
+    시험일 전날은 전범위 복습을 배정하세요.
 
     다음은 입력된 시험 과목 목록입니다:
     """
@@ -29,48 +56,316 @@ def generate_exam_plan(subjects, start_date):
 
     prompt += """
     
-    위 정보를 기반으로 날짜별 공부 계획을 한국어로 출력해주세요. 날짜와 과목, 학습 내용을 명확히 구분해주세요.
+    위 정보를 기반으로 한 날짜별 공부 계획을 JSON 배열로만 출력해주세요. 항목 하나는 하루에 한 과목의 학습이며,
+    date 는 "YYYY-MM-DD", subject 는 위 과목명 그대로, title 은 과목명을 포함한 짧은 한국어 학습 내용입니다.
+    날짜순으로 정렬하고, 조언이나 인사말 같은 다른 문장은 넣지 마세요.
+    """
+    return prompt
+
+def plan_cache_key(subjects, start_date):
+    return plan_cache.cache_key(subjects, start_date, PROMPT_VERSION, MODEL_NAME)
+
+def get_cached_plan(subjects, start_date):
+    """같은 입력으로 만든 계획이 저장돼 있으면 반환합니다. 없거나 끝까지 온 JSON 계획이 아니면 None."""
+    text = plan_cache.get(plan_cache_key(subjects, start_date))
+    if text is None:
+        return None
+    try:
+        validated_plan_records(text, subjects, start_date)
+    except ValueError:
+        return None
+    return text
+
+def _store_plan(subjects, start_date, text):
+    # 끊겼거나 형식이 틀린 응답은 저장하지 않습니다 (다음 실행에서 다시 요청합니다).
+    try:
+        validated_plan_records(text, subjects, start_date)
+    except ValueError as e:
+        print(f"공부 계획을 캐시에 저장하지 않음: {e}")
+        return
+    try:
+        plan_cache.put(plan_cache_key(subjects, start_date), text)
+    except OSError as e:
+        print(f"공부 계획 캐시 저장 실패: {e}")
+
+def request_exam_plan(subjects, start_date, regenerate=False):
+    """
+    generate_exam_plan 과 같지만 실패하면 예외를 그대로 올립니다 (다시 시도하는 쪽에서 씁니다).
+    응답이 끊겼거나 형식이 틀리면 저장하지 않고 ValueError 를 냅니다.
     """
+    if not regenerate:
+        cached = get_cached_plan(subjects, start_date)
+        if cached is not None:
+            return cached
+    response = get_model().generate_content(build_exam_prompt(subjects, start_date),
+                                              generation_config=PLAN_GENERATION_CONFIG)
+    text = response.text.strip()
+    validated_plan_records(text, subjects, start_date)
+    _store_plan(subjects, start_date, text)
+    return text
 
+def generate_exam_plan(subjects, start_date, regenerate=False):
+    """
+    계획 원문(JSON 문자열)을 반환합니다. 일정 목록은 plan_records 로 얻습니다.
+    regenerate=True 면 저장된 계획을 무시하고 새로 생성합니다 (결과는 다시 저장됩니다).
+    """
     try:
-        response = model.generate_content(prompt)
-        return response.text.strip()
+        return request_exam_plan(subjects, start_date, regenerate)
     except Exception as e:
         return f"❌ AI 계획 생성 실패: {str(e)}"
 
-def extract_schedule_from_plan(plan_text):
-    schedule = []
-    lines = plan_text.splitlines()
-    current_date = None
-    EXAM_YEAR = 2025
+def stream_exam_plan(subjects, start_date, cancel_event=None):
+    """
+    공부 계획(JSON)을 생성되는 대로 조각(str) 단위로 yield 합니다. 완성된 항목은 PlanRecordStream 으로 바로 꺼낼 수 있습니다.
+    cancel_event(threading.Event)가 설정되면 다음 조각을 받기 전에 멈춥니다. 실패하면 예외를 그대로 올립니다.
+    캐시는 읽지 않으며(get_cached_plan 사용), 끝까지 생성되고 검증된 계획만 저장합니다.
+    """
+    response = get_model().generate_content(build_exam_prompt(subjects, start_date),
+                                                  generation_config=PLAN_GENERATION_CONFIG, stream=True)
+    parts = []
+    for chunk in response:
+        if cancel_event is not None and cancel_event.is_set():
+            return
+        try:
+            text = chunk.text
+        except ValueError:
+            # 안전 필터 등으로 내용이 없는 조각
+            continue
+        if text:
+            parts.append(text)
+            yield text
+    if parts:
+        _store_plan(subjects, start_date, "".join(parts).strip())
 
-    skip_keywords = [
-        "추가 조언", "화이팅", "컨디션", "휴식", "수면", "계획은 예시",
-        "자신의 학습", "조정 가능합니다", "진도가 빨리", "예비 학습 시간",
-        "질문하고 해결", "규칙적인 휴식", "시험 준비에 도움이"
-    ]
+def _exam_dates(subjects):
+    exam_dates = {}
+    for s in subjects or ():
+        try:
+            exam_dates[s["subject"].strip()] = datetime.strptime(s["date"], "%Y-%m-%d").date()
+        except (KeyError, AttributeError, ValueError):
+            continue
+    return exam_dates
 
-    for line in lines:
-        line = line.strip()
+def _parse_start(start_date):
+    return datetime.strptime(start_date, "%Y-%m-%d").date() if start_date else None
+
+def _validate_record(item, start, exam_dates):
+    """JSON 항목 하나를 {date, subject, title} 로 정리합니다. 형식이 틀리거나 기간을 벗어나면 None."""
+    if not isinstance(item, dict):
+        return None
+    date_str, subject, title = item.get("date"), item.get("subject"), item.get("title")
+    if not (isinstance(date_str, str) and isinstance(subject, str) and isinstance(title, str)):
+        return None
+    subject, title = subject.strip(), title.strip()
+    try:
+        date = datetime.strptime(date_str.strip(), "%Y-%m-%d").date()
+    except ValueError:
+        return None
+    if not title:
+        return None
+    # 시작일 이전이거나 그 과목의 시험일 이후인 항목은 버립니다.
+    if start and date < start:
+        return None
+    if subject in exam_dates and date > exam_dates[subject]:
+        return None
+    return {"date": date.strftime("%Y-%m-%d"), "subject": subject, "title": title}
+
+_CODE_FENCE_RE = re.compile(r"^```[\w-]*\s*|\s*```\s*$")
+
+def looks_like_json_plan(plan_text):
+    """JSON 계획(코드 블록으로 감싼 것 포함)처럼 시작하는지. 이런 글에는 자유 글 추출을 쓰지 않습니다."""
+    return plan_text.lstrip().startswith(("[", "{", "```"))
+
+def parse_plan_json(plan_text, subjects=None, start_date=None):
+    """
+    JSON 계획을 한 번에 읽어 검증된 [{"date", "subject", "title"}, ...] (날짜순) 로 바꿉니다.
+    ```json 코드 블록은 벗겨 내며, 중간에 끊겼거나 배열이 아니면 ValueError 를 냅니다.
+    """
+    data = json.loads(_CODE_FENCE_RE.sub("", plan_text.strip()))
+    if isinstance(data, dict):
+        data = data.get("items", data.get("plan"))
+    if not isinstance(data, list):
+        raise ValueError("계획 JSON 이 배열이 아닙니다.")
+    start, exam_dates = _parse_start(start_date), _exam_dates(subjects)
+    records, seen = [], set()
+    for item in data:
+        record = _validate_record(item, start, exam_dates)
+        if record and (record["date"], record["title"]) not in seen:
+            seen.add((record["date"], record["title"]))
+            records.append(record)
+    records.sort(key=lambda r: r["date"])
+    return records
 
-        match_full = re.search(r"(\d{4})[.\-/ ]?(\d{1,2})[.\-/ ]?(\d{1,2})", line)
-        if match_full:
-            y, m, d = match_full.groups()
-            current_date = f"{int(y):04d}-{int(m):02d}-{int(d):02d}"
+class PlanRecordStream:
+    """
+    스트리밍으로 들어오는 JSON 배열 조각에서 완성된 항목만 바로 꺼냅니다.
+    아직 덜 온 마지막 항목만 다음 조각에서 다시 읽으므로 전체를 매번 다시 파싱하지 않습니다.
+    """
+
+    def __init__(self, subjects=None, start_date=None):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._start = _parse_start(start_date)
+        self._exam_dates = _exam_dates(subjects)
+        self._seen = set()
+        self.records = []
+        self._started = False  # 코드 블록 시작 줄(```json)을 건너뛰었는지
+        self.complete = False  # 배열 끝(']')까지 읽었는지
+        self.invalid = False   # JSON 배열이 아닌 글이 들어왔는지
+
+    def feed(self, text):
+        """조각을 더하고, 이번에 새로 완성된 검증된 항목들을 반환합니다."""
+        self._buffer += text
+        new_records = []
+        buffer = self._buffer
+        while not (self.complete or self.invalid):
+            pos = self._pos
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,[":
+                pos += 1
+            self._pos = pos
+            if pos >= len(buffer):
+                break
+            if not self._started and buffer[pos] == "`":
+                newline = buffer.find("\n", pos)
+                if newline < 0:
+                    break  # 코드 블록 시작 줄이 아직 다 오지 않았습니다.
+                self._pos = newline + 1
+                self._started = True
+                continue
+            self._started = True
+            if buffer[pos] == "]":
+                self.complete = True
+                break
+            if buffer[pos] != "{":
+                self.invalid = True
+                break
+            try:
+                item, end = self._decoder.raw_decode(buffer, pos)
+            except ValueError:
+                break  # 항목이 아직 다 오지 않았습니다.
+            self._pos = end
+            record = _validate_record(item, self._start, self._exam_dates)
+            if record and (record["date"], record["title"]) not in self._seen:
+                self._seen.add((record["date"], record["title"]))
+                new_records.append(record)
+        # 읽고 난 앞부분은 버려서 버퍼가 계속 커지지 않게 합니다.
+        self._buffer = buffer[self._pos:]
+        self._pos = 0
+        self.records.extend(new_records)
+        return new_records
+
+def validated_plan_records(plan_text, subjects=None, start_date=None):
+    """끝까지 온 JSON 계획만 받아들입니다. 끊겼거나 쓸 항목이 하나도 없으면 ValueError."""
+    records = parse_plan_json(plan_text, subjects, start_date)
+    if not records:
+        raise ValueError("계획에서 일정을 찾지 못했습니다.")
+    return records
+
+def plan_records(plan_text, subjects=None, start_date=None):
+    """
+    계획 원문 → 일정 목록.
+    JSON 계획이 중간에 끊겼으면 끊기기 전까지 완성된 항목만 돌려주고, 그런 항목도 없으면 ValueError 를 냅니다.
+    정규식 추출은 예전 형식(자유 글) 계획에만 씁니다.
+    """
+    if not looks_like_json_plan(plan_text):
+        return extract_schedule_from_plan(plan_text, subjects, start_date)
+    try:
+        return parse_plan_json(plan_text, subjects, start_date)
+    except ValueError:
+        record_stream = PlanRecordStream(subjects, start_date)
+        record_stream.feed(plan_text)
+        if record_stream.records:
+            return record_stream.records
+        raise ValueError("계획 JSON 이 중간에 끊겼거나 형식이 맞지 않습니다.")
+
+def format_plan_records(records, previous_date=None):
+    """
+    일정 목록을 날짜별 텍스트로 만듭니다.
+    previous_date 는 이미 화면에 찍은 마지막 날짜로, 이어 붙일 때 같은 날짜 제목을 다시 쓰지 않게 합니다.
+    """
+    lines = []
+    displayed = previous_date is not None
+    for record in records:
+        if record["date"] != previous_date:
+            previous_date = record["date"]
+            lines.append(("\n" if lines or displayed else "") + previous_date)
+        lines.append(f"- {record['title']}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+# 예전 형식(자유 글) 계획에서 일정을 뽑을 때 쓰는 패턴들
+_FULL_DATE_RE = re.compile(r"(\d{4})[.\-/ ]?(\d{1,2})[.\-/ ]?(\d{1,2})")
+_KOR_DATE_RE = re.compile(r"(\d{1,2})월\s*(\d{1,2})일")
+SKIP_KEYWORDS = [
+    "추가 조언", "화이팅", "컨디션", "휴식", "수면", "계획은 예시",
+    "자신의 학습", "조정 가능합니다", "진도가 빨리", "예비 학습 시간",
+    "질문하고 해결", "규칙적인 휴식", "시험 준비에 도움이"
+]
+_SKIP_RE = re.compile("|".join(re.escape(kw) for kw in SKIP_KEYWORDS))
+
+def _infer_year(month, day, reference_dates):
+    """
+    "M월 D일" 의 연도를 시작일·시험일로 추정합니다. 기간 안에 들어가는 연도를 고르고,
+    없으면 기간에서 가장 가까운 연도를 씁니다. 기준 날짜가 없으면 올해로 봅니다.
+    """
+    if not reference_dates:
+        return datetime.now().year
+    first, last = min(reference_dates), max(reference_dates)
+    best_year, best_gap = first.year, None
+    for year in range(first.year - 1, last.year + 2):
+        try:
+            candidate = datetime(year, month, day).date()
+        except ValueError:
             continue
+        gap = 0 if first <= candidate <= last else min(abs((candidate - first).days), abs((candidate - last).days))
+        if best_gap is None or gap < best_gap:
+            best_year, best_gap = year, gap
+    return best_year
 
-        match_kor = re.search(r"(\d{1,2})월\s*(\d{1,2})일", line)
-        if match_kor:
-            m, d = match_kor.groups()
-            current_date = f"{EXAM_YEAR}-{int(m):02d}-{int(d):02d}"
+def _parse_date_line(line, reference_dates):
+    match_full = _FULL_DATE_RE.search(line)
+    if match_full:
+        y, m, d = (int(g) for g in match_full.groups())
+    else:
+        match_kor = _KOR_DATE_RE.search(line)
+        if not match_kor:
+            return None
+        m, d = (int(g) for g in match_kor.groups())
+        y = _infer_year(m, d, reference_dates)
+    try:
+        return datetime(y, m, d).strftime("%Y-%m-%d")
+    except ValueError:
+        return None
+
+def extract_schedule_from_plan(plan_text, subjects=None, start_date=None):
+    """
+    자유 글 형식의 계획에서 날짜별 일정을 한 번 훑어 뽑습니다 (JSON 계획을 못 받았을 때만 씁니다).
+    연도가 없는 날짜는 시작일·시험일로 연도를 추정합니다.
+
+    :return: [{"date", "subject", "title"}, ...] subject 는 제목에 들어 있는 과목명 (없으면 "")
+    """
+    exam_dates = _exam_dates(subjects)
+    reference_dates = list(exam_dates.values())
+    if start_date:
+        reference_dates.append(_parse_start(start_date))
+    subject_names = sorted(exam_dates, key=len, reverse=True)
+
+    schedule = []
+    current_date = None
+    for line in plan_text.splitlines():
+        line = line.strip()
+        date_str = _parse_date_line(line, reference_dates)
+        if date_str:
+            current_date = date_str
             continue
 
         if current_date and line and not line.startswith("|") and not line.startswith("시험"):
             clean = line.lstrip("* •- ").strip()
-            if any(kw in clean for kw in skip_keywords):
+            if _SKIP_RE.search(clean):
                 continue
             clean = clean.rstrip(".").strip()
             if clean:
-                schedule.append({"date": current_date, "title": clean})
+                subject = next((name for name in subject_names if name in clean), "")
+                schedule.append({"date": current_date, "subject": subject, "title": clean})
 
-    return schedule
\ No newline at end of file
+    return schedule
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta
+
+# 네트워크 없이 바로 만드는 공부 계획.
+# 과목마다 학습량(많음/보통/적음)과 구분(전공/교양)으로 필요한 학습 블록 수를 정하고,
+# 하루에 쓸 수 있는 블록(daily_capacity)에서 이미 잡힌 일정 수를 뺀 만큼을
+# 시험이 가까운 과목부터 골고루 나눠 줍니다. 각 시험 전날은 그 과목의 전범위 복습을 먼저 한 블록 넣고,
+# 남는 블록은 다른 과목에 씁니다.
+WORKLOAD_BLOCKS = {"많음": 6, "보통": 4, "적음": 2}
+CATEGORY_WEIGHTS = {"전공": 1.5, "교양": 1.0}
+DAILY_CAPACITY = 3
+# 이미 캘린더에 있는 일정 한 건이 차지하는 블록 수
+EXISTING_EVENT_BLOCKS = 1
+
+
+def required_blocks(subject):
+    blocks = WORKLOAD_BLOCKS.get(subject.get("workload"), WORKLOAD_BLOCKS["보통"])
+    return max(1, round(blocks * CATEGORY_WEIGHTS.get(subject.get("category"), 1.0)))
+
+
+def load_existing_load(start_date, end_date):
+    """캘린더에 이미 있는 일정을 날짜별 블록 수로 셉니다."""
+    from plancalendar.event_store import load_range
+    days = load_range(start_date, end_date)
+    return {date: len(day["events"]) * EXISTING_EVENT_BLOCKS for date, day in days.items() if day["events"]}
+
+
+def plan_study_schedule(subjects, start_date, daily_capacity=DAILY_CAPACITY, existing_load=None):
+    """
+    :param subjects: {"subject", "date", "category", "workload"} 딕셔너리 리스트
+    :param start_date: 공부 시작일 "YYYY-MM-DD"
+    :param existing_load: {날짜: 이미 쓴 블록 수}. None 이면 캘린더에서 읽습니다.
+    :return: {"items": [{"date", "subject", "title"}, ...] (날짜순),
+              "unscheduled": {과목: 배정하지 못한 블록 수},
+              "skipped": [시험일이 시작일과 같거나 이전이라 계획을 세우지 못한 과목, ...]}
+    """
+    start = datetime.strptime(start_date, "%Y-%m-%d").date()
+    exams, skipped = [], []
+    for s in subjects:
+        exam_date = datetime.strptime(s["date"], "%Y-%m-%d").date()
+        if exam_date > start:
+            exams.append({"subject": s["subject"], "exam": exam_date, "review": exam_date - timedelta(days=1),
+                          "total": required_blocks(s), "remaining": required_blocks(s)})
+        else:
+            skipped.append(s["subject"])
+    if not exams:
+        return {"items": [], "unscheduled": {}, "skipped": skipped}
+
+    last_day = max(e["exam"] for e in exams)
+    if existing_load is None:
+        existing_load = load_existing_load(start_date, last_day.strftime("%Y-%m-%d"))
+
+    review_days = {}
+    for e in exams:
+        review_days.setdefault(e["review"], []).append(e)
+
+    items = []
+    day = start
+    while day < last_day:
+        date_str = day.strftime("%Y-%m-%d")
+        # 복습 블록을 먼저 넣고, 남는 블록을 다른 과목에 나눠 줍니다.
+        reviews = sorted(review_days.get(day, ()), key=lambda e: e["subject"])
+        for e in reviews:
+            items.append({"date": date_str, "subject": e["subject"], "title": f"{e['subject']} 전범위 복습"})
+        capacity = daily_capacity - existing_load.get(date_str, 0) - len(reviews)
+        blocks = {}
+        while capacity > 0:
+            candidates = [e for e in exams if e["remaining"] > 0 and day < e["review"]]
+            if not candidates:
+                break
+            # 남은 블록 ÷ 남은 공부일 이 큰(급한) 과목부터, 같으면 시험이 빠른 과목부터
+            target = max(candidates, key=lambda e: (e["remaining"] / _study_days_left(e, day),
+                                                     -e["exam"].toordinal(), e["subject"]))
+            target["remaining"] -= 1
+            blocks[target["subject"]] = blocks.get(target["subject"], 0) + 1
+            capacity -= 1
+        for subject, count in blocks.items():
+            items.append({"date": date_str, "subject": subject, "title": f"{subject} 학습 ({count}블록)"})
+        day += timedelta(days=1)
+
+    unscheduled = {e["subject"]: e["remaining"] for e in exams if e["remaining"] > 0}
+    return {"items": items, "unscheduled": unscheduled, "skipped": skipped}
+
+
+def _study_days_left(exam, day):
+    # day 부터 그 과목 복습일 전날까지의 날 수 (최소 1)
+    return max((exam["review"] - day).days, 1)
+
+
+def format_plan_text(plan):
+    """결과 창에 보여줄 날짜별 텍스트 (extract_schedule_from_plan 으로 다시 읽을 수 있는 형식)."""
+    lines = []
+    current = None
+    for item in plan["items"]:
+        if item["date"] != current:
+            current = item["date"]
+            lines.append(("\n" if lines else "") + current)
+        lines.append(f"- {item['title']}")
+    if plan["unscheduled"]:
+        lines.append("\n⚠ 하루 학습량 한도 때문에 배정하지 못한 블록:")
+        lines.extend(f"  {subject}: {blocks}블록" for subject, blocks in plan["unscheduled"].items())
+    if plan.get("skipped"):
+        lines.append("\n⚠ 시험일이 공부 시작일과 같거나 이전이라 계획에서 뺀 과목: " + ", ".join(plan["skipped"]))
+    return "\n".join(lines)
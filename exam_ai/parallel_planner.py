@@ -0,0 +1,181 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+from exam_ai.exam_scheduler_ai import get_cached_plan, request_exam_plan, validated_plan_records
+from exam_ai.offline_planner import DAILY_CAPACITY
+
+# 과목(또는 시험일이 가까운 과목 묶음)마다 계획을 따로 요청해 동시에 받고, 하나의 날짜별 일정으로 합칩니다.
+# 과목이 많아도 가장 느린 요청 하나만큼만 걸리며, 한 묶음이 실패해도 나머지 계획은 남습니다.
+MAX_WORKERS = 4
+# Gemini 무료 등급의 분당 요청 한도에 맞춘 토큰 버킷 설정
+REQUESTS_PER_MINUTE = 15
+BURST = 4
+MAX_ATTEMPTS = 3
+BACKOFF_BASE = 1.0  # 초. 시도할 때마다 두 배로 늘고 약간의 무작위 지연을 더합니다.
+# group_by="date" 일 때 시험일 간격이 이 일수 이하인 과목끼리 한 요청으로 묶습니다 (0 이면 같은 날 시험끼리).
+CLUSTER_GAP_DAYS = 0
+
+
+class TokenBucket:
+    """초당 rate 개씩 채워지고 최대 capacity 개까지 쌓이는 토큰 버킷. 여러 스레드에서 같이 씁니다."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cancel_event=None):
+        """토큰 하나를 얻을 때까지 기다립니다. cancel_event 가 설정되면 False 를 반환합니다."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if cancel_event is not None:
+                if cancel_event.wait(wait):
+                    return False
+            else:
+                time.sleep(wait)
+
+
+def cluster_subjects(subjects, group_by="subject", gap_days=CLUSTER_GAP_DAYS):
+    """
+    요청 단위로 과목을 나눕니다.
+
+    :param group_by: "subject" 면 과목마다 하나, "date" 면 시험일이 gap_days 이내로 이어지는 과목끼리 하나
+    :return: [[과목, ...], ...] (시험일순)
+    """
+    ordered = sorted(subjects, key=lambda s: (s["date"], s["subject"]))
+    if group_by != "date":
+        return [[s] for s in ordered]
+    clusters = []
+    previous = None
+    for s in ordered:
+        exam = datetime.strptime(s["date"], "%Y-%m-%d").date()
+        if clusters and (exam - previous).days <= gap_days:
+            clusters[-1].append(s)
+        else:
+            clusters.append([s])
+        previous = exam
+    return clusters
+
+
+def _cluster_label(cluster):
+    return ", ".join(s["subject"] for s in cluster)
+
+
+def _request_with_retry(cluster, start_date, bucket, regenerate, cancel_event, max_attempts):
+    # 저장된 계획은 요청 한도를 쓰지 않고 바로 씁니다 (get_cached_plan 은 끝까지 온 JSON 계획만 돌려줍니다).
+    if not regenerate:
+        cached = get_cached_plan(cluster, start_date)
+        if cached is not None:
+            return validated_plan_records(cached, cluster, start_date)
+    # 네트워크 오류·한도 초과·끊겼거나 형식이 틀린 응답은 지수 백오프로 다시 요청합니다.
+    for attempt in range(max_attempts):
+        if not bucket.acquire(cancel_event):
+            return None
+        try:
+            text = request_exam_plan(cluster, start_date, regenerate=True)
+            return validated_plan_records(text, cluster, start_date)
+        except Exception as e:
+            if attempt == max_attempts - 1:
+                raise
+            delay = BACKOFF_BASE * (2 ** attempt) + random.uniform(0, BACKOFF_BASE)
+            print(f"공부 계획 요청 실패 ({_cluster_label(cluster)}, {attempt + 1}회): {e} - {delay:.1f}초 후 다시 시도")
+            if cancel_event is not None and cancel_event.wait(delay):
+                return None
+            if cancel_event is None:
+                time.sleep(delay)
+    return None
+
+
+def merge_partial_plans(partials, subjects, start_date, max_per_day=DAILY_CAPACITY):
+    """
+    과목별 계획들을 하나의 날짜별 일정으로 합칩니다.
+    같은 날짜·내용은 한 번만 남기고, 하루 항목이 max_per_day 를 넘으면 시험이 늦은 과목의 항목부터
+    그 과목 시험 전의 가장 가까운 빈 날(앞쪽 먼저)로 옮깁니다. 옮길 곳이 없으면 그 날에 그대로 둡니다.
+    시험 전날의 그 과목 항목(전범위 복습)은 옮기지 않습니다.
+
+    :param partials: [[{"date", "subject", "title"}, ...], ...]
+    :return: 날짜순 [{"date", "subject", "title"}, ...]
+    """
+    start = datetime.strptime(start_date, "%Y-%m-%d").date()
+    exam_dates = {s["subject"].strip(): datetime.strptime(s["date"], "%Y-%m-%d").date() for s in subjects}
+    far_future = max(exam_dates.values(), default=start) + timedelta(days=1)
+
+    days = {}
+    seen = set()
+    for records in partials:
+        for record in records:
+            key = (record["date"], record["title"])
+            if key in seen:
+                continue
+            seen.add(key)
+            days.setdefault(datetime.strptime(record["date"], "%Y-%m-%d").date(), []).append(record)
+
+    def is_fixed(day, record):
+        exam = exam_dates.get(record["subject"])
+        return exam is not None and day == exam - timedelta(days=1)
+
+    for day in sorted(days):
+        items = days[day]
+        if len(items) <= max_per_day:
+            continue
+        # 고정 항목과 시험이 빠른 과목을 먼저 남깁니다.
+        items.sort(key=lambda r: (not is_fixed(day, r), exam_dates.get(r["subject"], far_future)))
+        keep, overflow = items[:max_per_day], items[max_per_day:]
+        for record in overflow:
+            target = None
+            if not is_fixed(day, record):
+                last_day = exam_dates.get(record["subject"], far_future) - timedelta(days=1)
+                earlier = [day - timedelta(days=n) for n in range(1, (day - start).days + 1)]
+                later = [day + timedelta(days=n) for n in range(1, (last_day - day).days)]
+                target = next((d for d in earlier + later if len(days.get(d, ())) < max_per_day), None)
+            if target is None:
+                keep.append(record)
+            else:
+                days.setdefault(target, []).append(dict(record, date=target.strftime("%Y-%m-%d")))
+        days[day] = keep
+
+    return [record for day in sorted(days) for record in days[day]]
+
+
+def generate_parallel_plan(subjects, start_date, group_by="subject", regenerate=False, cancel_event=None,
+                           on_progress=None, max_workers=MAX_WORKERS, requests_per_minute=REQUESTS_PER_MINUTE,
+                           max_attempts=MAX_ATTEMPTS):
+    """
+    묶음마다 계획을 동시에 요청해 합칩니다. 묶음별 결과는 일반 계획과 같은 캐시에 저장됩니다.
+
+    :param on_progress: 묶음 하나가 끝날 때마다 (끝난 수, 전체 수) 로 호출 (작업자 스레드에서 불립니다)
+    :return: {"records": 합친 일정, "failed": {묶음 이름: 오류 문자열}, "cancelled": bool}
+    """
+    clusters = cluster_subjects(subjects, group_by)
+    bucket = TokenBucket(requests_per_minute / 60.0, BURST)
+    partials, failed = [], {}
+    if not clusters:
+        return {"records": [], "failed": failed, "cancelled": False}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(clusters))) as executor:
+        futures = {executor.submit(_request_with_retry, cluster, start_date, bucket, regenerate,
+                                   cancel_event, max_attempts): cluster for cluster in clusters}
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                records = future.result()
+                if records is not None:
+                    partials.append(records)
+            except Exception as e:
+                failed[_cluster_label(futures[future])] = str(e)
+            if on_progress is not None:
+                on_progress(done, len(clusters))
+
+    cancelled = cancel_event is not None and cancel_event.is_set()
+    return {"records": merge_partial_plans(partials, subjects, start_date), "failed": failed, "cancelled": cancelled}
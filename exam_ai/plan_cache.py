@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+# 공부 계획 생성 결과 캐시.
+# 같은 과목 목록·시작일·프롬프트 버전·모델로 만든 계획은 디스크에 저장해 두고 다시 쓰며,
+# 개수나 전체 크기가 한도를 넘으면 가장 오래 쓰지 않은 항목부터 지웁니다.
+CACHE_DIR = "exam_plan_cache"
+MAX_ENTRIES = 50
+MAX_TOTAL_BYTES = 5 * 1024 * 1024
+
+_lock = threading.Lock()
+
+
+def normalize_subjects(subjects):
+    """비교용으로 과목 목록을 정리합니다: 앞뒤 공백 제거, 시험일·과목명 순 정렬."""
+    normalized = [{
+        "subject": str(s.get("subject", "")).strip(),
+        "date": str(s.get("date", "")).strip(),
+        "category": str(s.get("category", "")).strip(),
+        "workload": str(s.get("workload", "")).strip()
+    } for s in subjects]
+    return sorted(normalized, key=lambda s: (s["date"], s["subject"], s["category"], s["workload"]))
+
+
+def cache_key(subjects, start_date, prompt_version, model_name):
+    payload = json.dumps({
+        "subjects": normalize_subjects(subjects),
+        "start_date": start_date,
+        "prompt_version": prompt_version,
+        "model": model_name
+    }, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cache_path(key):
+    return os.path.join(CACHE_DIR, key + ".json")
+
+
+def get(key):
+    """저장된 계획 문자열. 없으면 None. 읽은 항목은 가장 최근에 쓴 것으로 표시됩니다."""
+    path = _cache_path(key)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+        os.utime(path)
+    except (OSError, ValueError):
+        return None
+    return entry.get("text")
+
+
+def put(key, text):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _cache_path(key)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"text": text, "created_at": time.time()}, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    _evict()
+
+
+def _evict():
+    with _lock:
+        entries = []
+        for name in os.listdir(CACHE_DIR):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(CACHE_DIR, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort(reverse=True)  # 최근에 쓴 것부터
+        total = 0
+        for index, (_, size, path) in enumerate(entries):
+            total += size
+            if index >= MAX_ENTRIES or total > MAX_TOTAL_BYTES:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def clear():
+    if not os.path.isdir(CACHE_DIR):
+        return
+    for name in os.listdir(CACHE_DIR):
+        try:
+            os.remove(os.path.join(CACHE_DIR, name))
+        except OSError:
+            pass
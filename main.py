@@ -1,11 +1,12 @@
 # GUI 실행
+from ui import startup_timing
 import os
 from dotenv import load_dotenv
 
 # .env 파일에서 환경 변수를 로드합니다.
 load_dotenv()
 
-from ui.interface import launch_main_gui
+interface = startup_timing.timed_import("ui.interface")
 
 if __name__ == "__main__":
-    launch_main_gui()
+    interface.launch_main_gui()
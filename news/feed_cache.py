@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# RSS 피드용 HTTP 캐시.
+# 모든 요청은 연결을 재사용하는 하나의 세션으로 보내고, 응답 본문은 디스크에 저장합니다.
+# TTL 안의 요청은 네트워크 없이 캐시로 응답하고, TTL 이 지나면 ETag / Last-Modified 로
+# 조건부 요청을 보내 바뀌지 않았으면(304) 저장된 본문을 그대로 씁니다.
+CACHE_DIR = "news_cache"
+FEED_TTL_SECONDS = int(os.getenv("PLANMAN_FEED_TTL", "300"))
+REQUEST_HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+_session = None
+_session_lock = threading.Lock()
+_memory = {}  # url → (메타데이터, 본문)
+_cache_lock = threading.Lock()
+_stats = {"hits": 0, "revalidated": 0, "misses": 0, "stale": 0}
+
+
+def get_session():
+    """연결 풀을 공유하는 requests 세션 (keep-alive)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(REQUEST_HEADERS)
+            _session = session
+        return _session
+
+
+def get_cache_stats():
+    """캐시 적중/재검증/미스/만료본 사용 횟수."""
+    with _cache_lock:
+        return dict(_stats)
+
+
+def reset_cache_stats():
+    with _cache_lock:
+        for key in _stats:
+            _stats[key] = 0
+
+
+def _count(key):
+    with _cache_lock:
+        _stats[key] += 1
+
+
+def _cache_paths(url):
+    name = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, name + ".json"), os.path.join(CACHE_DIR, name + ".xml")
+
+
+def _read_entry(url):
+    with _cache_lock:
+        if url in _memory:
+            return _memory[url]
+    meta_path, body_path = _cache_paths(url)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            body = f.read()
+    except (OSError, ValueError):
+        return None
+    with _cache_lock:
+        _memory[url] = (meta, body)
+    return meta, body
+
+
+def _atomic_write(path, data):
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _write_entry(url, meta, body=None):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    meta_path, body_path = _cache_paths(url)
+    if body is not None:
+        _atomic_write(body_path, body)
+    else:
+        body = _read_entry(url)[1]
+    _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+    with _cache_lock:
+        _memory[url] = (meta, body)
+
+
+def fetch_feed(url, ttl=FEED_TTL_SECONDS, timeout=5):
+    """
+    피드 본문(bytes)을 반환합니다.
+    네트워크 오류가 나면 저장된 본문이 있을 경우 그것을 돌려주고, 없으면 예외를 그대로 올립니다.
+    """
+    entry = _read_entry(url)
+    now = time.time()
+    if entry and now - entry[0].get("fetched_at", 0) < ttl:
+        _count("hits")
+        return entry[1]
+
+    headers = {}
+    if entry:
+        if entry[0].get("etag"):
+            headers["If-None-Match"] = entry[0]["etag"]
+        if entry[0].get("last_modified"):
+            headers["If-Modified-Since"] = entry[0]["last_modified"]
+
+    try:
+        res = get_session().get(url, headers=headers, timeout=timeout)
+        if res.status_code == 304 and entry:
+            meta = dict(entry[0], fetched_at=now)
+            _write_entry(url, meta)
+            _count("revalidated")
+            return entry[1]
+        res.raise_for_status()
+    except requests.exceptions.RequestException:
+        if entry:
+            _count("stale")
+            return entry[1]
+        raise
+
+    meta = {
+        "url": url,
+        "etag": res.headers.get("ETag"),
+        "last_modified": res.headers.get("Last-Modified"),
+        "fetched_at": now
+    }
+    _write_entry(url, meta, res.content)
+    _count("misses")
+    return res.content
@@ -0,0 +1,221 @@
+import heapq
+import itertools
+import queue
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from news.feed_cache import fetch_feed
+from news.rss_stream import parse_rss_items
+
+# 백그라운드 뉴스 수집기.
+# 피드마다 정해진 주기로 가져와 guid/link 로 색인하고, 여러 피드에 같은 기사가 있으면 하나로 합칩니다.
+# 새로 들어온 기사만 구독자에게 알리고, 화면은 메모리에 쌓인 결과를 바로 읽어 갑니다.
+DEFAULT_POLL_INTERVAL = 300  # 초
+ITEMS_PER_FEED = 30
+MAX_ITEMS_PER_CATEGORY = 100
+FETCH_WORKERS = 3
+
+_TITLE_NOISE_RE = re.compile(r"\[[^\]]*\]|\([^)]*\)|[^\w]+")
+
+
+def normalize_title(title):
+    # "[속보]" 같은 머리말, 괄호, 문장부호, 공백을 지워 다른 피드의 같은 기사를 찾는 데 씁니다.
+    return _TITLE_NOISE_RE.sub("", title).lower()
+
+
+def _published_timestamp(published, fallback):
+    if published:
+        try:
+            dt = parsedate_to_datetime(published)
+        except (TypeError, ValueError):
+            try:
+                dt = datetime.fromisoformat(published.replace("Z", "+00:00"))
+            except ValueError:
+                return fallback
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.timestamp()
+    return fallback
+
+
+class NewsAggregator:
+    """
+    category_feeds: {카테고리: [피드 URL, ...]}
+    poll_intervals: {피드 URL: 초} — 없으면 default_interval
+    """
+
+    def __init__(self, category_feeds, default_interval=DEFAULT_POLL_INTERVAL, poll_intervals=None,
+                 workers=FETCH_WORKERS):
+        self._category_feeds = {c: list(feeds) for c, feeds in category_feeds.items()}
+        self._feed_categories = {}
+        for category, feeds in self._category_feeds.items():
+            for url in feeds:
+                self._feed_categories.setdefault(url, []).append(category)
+        self._intervals = {url: (poll_intervals or {}).get(url, default_interval) for url in self._feed_categories}
+        self._workers = workers
+
+        self._lock = threading.Lock()
+        self._items = {}  # 키(guid 또는 link) → 기사
+        self._title_keys = {}  # 정규화한 제목 → 키
+        self._by_category = {c: [] for c in self._category_feeds}  # 카테고리 → 키 리스트 (최신순)
+        self._polled_feeds = set()
+        self._errors = {}  # 피드 URL → 마지막 오류 메시지
+        self._subscribers = []
+
+        self._schedule = []  # (다음 수집 시각, 피드 URL)
+        self._work = queue.PriorityQueue()  # (우선순위, 순번, 피드 URL)
+        self._order = itertools.count()
+        self._in_flight = set()
+        self._wakeup = threading.Event()
+        self._running = False
+
+    # ---- 시작/정지 ----
+    def start(self):
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+        now = time.time()
+        self._schedule = [(now, url) for url in self._feed_categories]
+        heapq.heapify(self._schedule)
+        threading.Thread(target=self._scheduler_loop, daemon=True).start()
+        for _ in range(self._workers):
+            threading.Thread(target=self._worker_loop, daemon=True).start()
+
+    def stop(self):
+        with self._lock:
+            self._running = False
+        self._wakeup.set()
+        for _ in range(self._workers):
+            self._work.put((-1, next(self._order), None))
+
+    # ---- 조회 ----
+    def categories(self):
+        return list(self._category_feeds)
+
+    def get_items(self, category, limit=10):
+        """카테고리의 최신 기사들 (메모리에서 바로 반환)."""
+        with self._lock:
+            return [dict(self._items[key]) for key in self._by_category.get(category, [])[:limit]]
+
+    def is_ready(self, category):
+        """카테고리의 피드를 모두 한 번 이상 시도했는지."""
+        with self._lock:
+            return all(url in self._polled_feeds for url in self._category_feeds.get(category, []))
+
+    def get_error(self, category):
+        with self._lock:
+            errors = [self._errors[url] for url in self._category_feeds.get(category, []) if url in self._errors]
+        return errors[0] if errors else None
+
+    def subscribe(self, callback):
+        """새 기사가 들어오면 callback(category, new_items) 를 수집 스레드에서 호출합니다."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def poll_now(self, category):
+        """카테고리의 피드들을 다른 대기 작업보다 먼저 가져오도록 요청합니다."""
+        for url in self._category_feeds.get(category, []):
+            self._work.put((0, next(self._order), url))
+
+    # ---- 내부 ----
+    def _scheduler_loop(self):
+        while self._running:
+            now = time.time()
+            while self._schedule and self._schedule[0][0] <= now:
+                _, url = heapq.heappop(self._schedule)
+                self._work.put((1, next(self._order), url))
+                heapq.heappush(self._schedule, (now + self._intervals[url], url))
+            wait = self._schedule[0][0] - now if self._schedule else DEFAULT_POLL_INTERVAL
+            self._wakeup.wait(timeout=max(wait, 0.1))
+            self._wakeup.clear()
+
+    def _worker_loop(self):
+        while True:
+            _, _, url = self._work.get()
+            if url is None:
+                return
+            with self._lock:
+                if url in self._in_flight:
+                    continue
+                self._in_flight.add(url)
+            try:
+                self._poll_feed(url)
+            finally:
+                with self._lock:
+                    self._in_flight.discard(url)
+
+    def _poll_feed(self, url):
+        try:
+            # 수집 주기보다 짧은 TTL 로 디스크 캐시를 써서, 재시작 직후에는 네트워크 없이 채웁니다.
+            content = fetch_feed(url, ttl=self._intervals[url] / 2)
+            entries = parse_rss_items(content, limit=ITEMS_PER_FEED)
+        except Exception as e:
+            with self._lock:
+                self._errors[url] = str(e)
+                self._polled_feeds.add(url)
+            return
+        new_by_category = self._merge(url, entries)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for category, new_items in new_by_category.items():
+            for callback in subscribers:
+                try:
+                    callback(category, new_items)
+                except Exception as e:
+                    print(f"뉴스 구독자 처리 실패: {e}")
+
+    def _merge(self, url, entries):
+        now = time.time()
+        new_by_category = {}
+        with self._lock:
+            self._errors.pop(url, None)
+            self._polled_feeds.add(url)
+            for rank, entry in enumerate(entries):
+                key = entry.get("guid") or entry.get("link")
+                if not key or not entry.get("title"):
+                    continue
+                title_key = normalize_title(entry["title"])
+                existing = self._items.get(key) or self._items.get(self._title_keys.get(title_key))
+                categories = self._feed_categories[url]
+                if existing is None:
+                    item = {
+                        "title": entry["title"],
+                        "link": entry["link"],
+                        "guid": key,
+                        "source": url,
+                        # 발행 시각이 없으면 피드 안 순서를 유지하도록 수집 시각에서 순위만큼 뺍니다.
+                        "published_ts": _published_timestamp(entry.get("published"), now - rank)
+                    }
+                    self._items[key] = item
+                    if title_key:
+                        self._title_keys[title_key] = key
+                    target = categories
+                else:
+                    item = existing
+                    key = item["guid"]
+                    target = [c for c in categories if key not in self._by_category[c]]
+                for category in target:
+                    self._by_category[category].append(key)
+                    new_by_category.setdefault(category, []).append(dict(item))
+            for category in new_by_category:
+                keys = self._by_category[category]
+                keys.sort(key=lambda k: self._items[k]["published_ts"], reverse=True)
+                del keys[MAX_ITEMS_PER_CATEGORY:]
+            self._prune()
+        return new_by_category
+
+    def _prune(self):
+        live = set(itertools.chain.from_iterable(self._by_category.values()))
+        for key in [k for k in self._items if k not in live]:
+            title_key = normalize_title(self._items.pop(key)["title"])
+            if self._title_keys.get(title_key) == key:
+                del self._title_keys[title_key]
@@ -1,35 +1,56 @@
-import requests
-from bs4 import BeautifulSoup
-
-# 뉴스 카테고리별 URL
-CATEGORY_RSS = {
-    "정치": "https://www.yna.co.kr/rss/politics.xml",
-    "경제": "https://www.yna.co.kr/rss/economy.xml",
-    "사회/문화": "https://rss.etnews.com/Section904.xml",
-    "산업/과학": "https://rss.etnews.com/Section903.xml",
-    "세계": "https://www.yna.co.kr/rss/international.xml"
+import threading
+
+from news.feed_cache import fetch_feed
+from news.rss_stream import parse_rss_items
+
+# 카테고리별로 보여줄 뉴스 개수
+NEWS_LIMIT = 10
+
+# 뉴스 카테고리별 피드 URL 목록 (한 카테고리에 여러 언론사 피드를 둘 수 있습니다)
+CATEGORY_FEEDS = {
+    "정치": ["https://www.yna.co.kr/rss/politics.xml"],
+    "경제": ["https://www.yna.co.kr/rss/economy.xml"],
+    "사회·문화": ["https://rss.etnews.com/Section904.xml"],
+    "산업·과학": ["https://rss.etnews.com/Section903.xml"],
+    "세계": ["https://www.yna.co.kr/rss/international.xml"]
 }
 
-# 뉴스 제목 출력
+# 예전 코드와의 호환용: 카테고리별 대표 피드
+CATEGORY_RSS = {category: feeds[0] for category, feeds in CATEGORY_FEEDS.items()}
+
+_aggregator = None
+_aggregator_lock = threading.Lock()
+
+
+def get_aggregator():
+    """CATEGORY_FEEDS 를 수집하는 공용 NewsAggregator (start() 는 호출하는 쪽에서)."""
+    global _aggregator
+    with _aggregator_lock:
+        if _aggregator is None:
+            from news.news_aggregator import NewsAggregator
+            _aggregator = NewsAggregator(CATEGORY_FEEDS)
+        return _aggregator
+
+
+def start_background_news():
+    aggregator = get_aggregator()
+    aggregator.start()
+    return aggregator
+
+
+# 뉴스 제목 출력 (수집기를 거치지 않고 한 번 가져오기)
 def get_news_items_by_category(category):
-    url = CATEGORY_RSS.get(category)
-    if not url:
+    feeds = CATEGORY_FEEDS.get(category)
+    if not feeds:
         return [{"title": f"❌ '{category}' 카테고리에 대한 RSS가 없습니다.", "link": ""}]
 
-    headers = {"User-Agent": "Mozilla/5.0"}
     try:
-        res = requests.get(url, headers=headers, timeout=5)
-        res.raise_for_status()
-        soup = BeautifulSoup(res.content, "xml")
-        items = soup.find_all("item")
-
         news_list = []
-        for item in items[:10]:
-            title = item.title.text.strip()
-            link = item.link.text.strip()
-            news_list.append({"title": title, "link": link})
+        for url in feeds:
+            content = fetch_feed(url, timeout=5)
+            news_list.extend(parse_rss_items(content, limit=NEWS_LIMIT))
 
-        return news_list if news_list else [{"title": "❌ 뉴스 없음", "link": ""}]
+        return news_list[:NEWS_LIMIT] if news_list else [{"title": "❌ 뉴스 없음", "link": ""}]
 
     except Exception as e:
         return [{"title": f"❌ 뉴스 로드 실패: {str(e)}", "link": ""}]
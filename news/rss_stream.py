@@ -0,0 +1,73 @@
+from xml.etree.ElementTree import XMLPullParser, ParseError
+
+# 스트리밍 RSS 파서.
+# 본문을 조각(chunk) 단위로 넣으면서 <item> 이 닫힐 때마다 {title, link, guid, published} 를 내보내고,
+# 필요한 개수를 채우면 나머지는 읽지 않습니다. 처리한 item 요소는 트리에서 떼어내 메모리를 돌려줍니다.
+CHUNK_SIZE = 16 * 1024
+
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_text(elem, name):
+    for child in elem:
+        if _local_name(child.tag) == name:
+            if name == "link" and not (child.text or "").strip():
+                # Atom 형식은 <link href="..."/> 를 씁니다.
+                return child.get("href", "").strip()
+            return (child.text or "").strip()
+    return ""
+
+
+def iter_rss_items(content, limit=10, chunk_size=CHUNK_SIZE):
+    """
+    RSS/Atom 본문(bytes)에서 {title, link, guid, published} 를 순서대로 최대 limit 개 yield 합니다.
+    guid 가 없으면 link 를, published 가 없으면 빈 문자열을 씁니다.
+
+    :raises xml.etree.ElementTree.ParseError: 형식이 깨졌거나 expat 이 모르는 인코딩인 경우
+    """
+    parser = XMLPullParser(events=("start", "end"))
+    stack = []
+    count = 0
+    for offset in range(0, len(content), chunk_size):
+        parser.feed(content[offset:offset + chunk_size])
+        for event, elem in parser.read_events():
+            if event == "start":
+                stack.append(elem)
+                continue
+            stack.pop()
+            if _local_name(elem.tag) not in ("item", "entry"):
+                continue
+            link = _child_text(elem, "link")
+            yield {
+                "title": _child_text(elem, "title"),
+                "link": link,
+                "guid": _child_text(elem, "guid") or _child_text(elem, "id") or link,
+                "published": _child_text(elem, "pubDate") or _child_text(elem, "published") or _child_text(elem, "updated")
+            }
+            count += 1
+            if stack:
+                stack[-1].remove(elem)
+            if count >= limit:
+                return
+    parser.close()
+
+
+def parse_rss_items(content, limit=10):
+    """iter_rss_items 결과를 리스트로. 스트리밍 파서가 읽지 못하는 피드는 BeautifulSoup 으로 처리합니다."""
+    try:
+        return list(iter_rss_items(content, limit))
+    except ParseError:
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(content, "xml")
+        items = []
+        for item in soup.find_all("item", limit=limit):
+            link = item.link.text.strip()
+            items.append({
+                "title": item.title.text.strip(),
+                "link": link,
+                "guid": item.guid.text.strip() if item.guid else link,
+                "published": item.pubDate.text.strip() if item.pubDate else ""
+            })
+        return items
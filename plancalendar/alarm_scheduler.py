@@ -0,0 +1,184 @@
+import heapq
+import threading
+from datetime import datetime, timedelta
+
+from plancalendar import event_store
+
+# 알림 단계: (키, 일정 몇 초 전에 울릴지, 토스트 제목)
+ALARM_LEVELS = [
+    ("upcoming", 86400, "📅 다가오는 일정"),
+    ("urgent", 7200, "⏰ 임박한 일정!"),
+]
+# 앞으로 몇 시간 안의 일정만 힙에 올려 둘지
+DEFAULT_HORIZON_HOURS = 24
+# 창(window)을 다시 읽어 새로 범위에 들어온 날짜를 반영하는 주기
+REFRESH_INTERVAL = timedelta(minutes=30)
+
+
+def parse_event_datetime(date_str, time_str):
+    """ "YYYY-MM-DD" 와 "HH:MM" 또는 "HH:MM ~ HH:MM" 형식의 시간을 datetime 으로 바꿉니다. 실패하면 None."""
+    if not time_str:
+        return None
+    try:
+        return datetime.strptime(f"{date_str} {time_str.split('~')[0].strip()}", "%Y-%m-%d %H:%M")
+    except ValueError:
+        return None
+
+
+def alarm_key(date_str, event, level):
+    # 같은 날짜/시간/제목의 일정은 같은 알림으로 취급합니다. 시간이나 제목이 바뀌면 새 알림이 됩니다.
+    return f"{date_str} {event.get('time', '')}|{event.get('title', '')}|{level}"
+
+
+class AlarmScheduler:
+    """
+    다가오는 일정의 알림 시각을 최소 힙으로 관리하는 백그라운드 스케줄러.
+    앞으로 horizon_hours 안의 날짜만 읽고, 일정이 바뀌면 해당 날짜만 다시 읽습니다.
+    이미 보낸 알림은 저장소에 기록되어 재시작해도 다시 뜨지 않습니다.
+    """
+
+    def __init__(self, notify, horizon_hours=DEFAULT_HORIZON_HOURS):
+        self._notify = notify
+        self._horizon = timedelta(hours=horizon_hours)
+        self._heap = []  # (울릴 시각, 순번, 날짜, 세대, 키, 알림 제목, 일정 시각, 일정 제목)
+        self._seq = 0
+        self._generation = {}  # 날짜별 세대 번호. 다시 읽힌 날짜의 예전 항목은 무시됩니다.
+        self._notified = set()
+        self._dirty_dates = set()
+        self._next_refresh = None
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        event_store.add_change_listener(self.invalidate)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        event_store.remove_change_listener(self.invalidate)
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+
+    def rebuild(self, now=None):
+        """앞으로의 창을 다시 읽어 힙을 새로 만들고, 대기 중인 알림 수를 반환합니다."""
+        with self._cond:
+            self._load_window(now or datetime.now())
+            return len(self._heap)
+
+    def invalidate(self, dates):
+        """일정이 추가/수정/삭제된 날짜들을 다시 읽도록 표시합니다."""
+        with self._cond:
+            self._dirty_dates.update(dates)
+            self._cond.notify()
+
+    def _window_dates(self, now):
+        start = now.date()
+        end = (now + self._horizon + REFRESH_INTERVAL).date()
+        return start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+
+    def _load_window(self, now):
+        start, end = self._window_dates(now)
+        event_store.prune_notified((now - timedelta(days=1)).strftime("%Y-%m-%d %H:%M"))
+        self._notified = event_store.load_notified_keys(now.strftime("%Y-%m-%d %H:%M"))
+        self._heap = []
+        self._generation = {}
+        for date_str, content in event_store.load_range(start, end).items():
+            self._push_day(date_str, content.get("events") or [], now)
+        self._next_refresh = now + REFRESH_INTERVAL
+
+    def _reload_dates(self, dates, now):
+        start, end = self._window_dates(now)
+        for date_str in dates:
+            self._generation[date_str] = self._generation.get(date_str, 0) + 1
+            if start <= date_str <= end:
+                self._push_day(date_str, event_store.load_day(date_str).get("events") or [], now)
+
+    def _push_day(self, date_str, events, now):
+        generation = self._generation.setdefault(date_str, 0)
+        for event in events:
+            event_dt = parse_event_datetime(date_str, event.get("time", ""))
+            # 다음 창 갱신 전에 울려야 할 알림까지 포함하도록 갱신 주기만큼 여유를 둡니다.
+            if event_dt is None or event_dt < now or event_dt - now > self._horizon + REFRESH_INTERVAL:
+                continue
+            # 이미 지난 단계 중에서는 가장 임박한 단계 하나만 울립니다.
+            due_levels = [lvl for lvl in ALARM_LEVELS if event_dt - timedelta(seconds=lvl[1]) <= now]
+            skip = {lvl[0] for lvl in due_levels[:-1]}
+            for level, lead_sec, title in ALARM_LEVELS:
+                key = alarm_key(date_str, event, level)
+                if level in skip or key in self._notified:
+                    continue
+                fire_at = max(event_dt - timedelta(seconds=lead_sec), now)
+                self._seq += 1
+                heapq.heappush(self._heap, (fire_at, self._seq, date_str, generation, key,
+                                            title, event_dt, event.get("title", "")))
+
+    def _pop_due(self, now):
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            fire_at, _, date_str, generation, key, title, event_dt, event_title = heapq.heappop(self._heap)
+            if generation != self._generation.get(date_str) or key in self._notified:
+                continue
+            if event_dt < now:
+                continue
+            self._notified.add(key)
+            due.append((key, title, event_dt, event_title))
+        return due
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                now = datetime.now()
+                if event_store.ALL_DATES in self._dirty_dates:
+                    # 반복 규칙 변경처럼 날짜를 특정할 수 없으면 창 전체를 다시 읽습니다.
+                    self._next_refresh = None
+                if self._next_refresh is None or now >= self._next_refresh:
+                    self._dirty_dates.clear()
+                    self._load_window(now)
+                elif self._dirty_dates:
+                    dates = set(self._dirty_dates)
+                    self._dirty_dates.clear()
+                    self._reload_dates(dates, now)
+                due = self._pop_due(now)
+                if not due:
+                    wake_at = self._next_refresh
+                    if self._heap:
+                        wake_at = min(wake_at, self._heap[0][0])
+                    self._cond.wait(timeout=max((wake_at - now).total_seconds(), 0.5))
+                    continue
+            for key, title, event_dt, event_title in due:
+                event_at = event_dt.strftime("%Y-%m-%d %H:%M")
+                event_store.mark_notified(key, event_at)
+                try:
+                    self._notify(title, f"{event_title} - {event_at}")
+                except Exception as e:
+                    print(f"알림 표시 실패: {e}")
+
+
+_default_scheduler = None
+_toaster = None
+
+
+def show_toast(title, message):
+    # win10toast 는 첫 알림을 띄울 때 불러옵니다.
+    global _toaster
+    if _toaster is None:
+        from win10toast import ToastNotifier
+        _toaster = ToastNotifier()
+    _toaster.show_toast(title, message, duration=10)
+
+
+def start_default_scheduler():
+    """토스트 알림을 띄우는 기본 스케줄러를 (한 번만) 시작하고 반환합니다."""
+    global _default_scheduler
+    if _default_scheduler is None:
+        _default_scheduler = AlarmScheduler(show_toast)
+        _default_scheduler.start()
+    return _default_scheduler
@@ -1,61 +1,104 @@
-import json
-import os
-from datetime import datetime, timedelta
+from datetime import datetime
 import tkinter as tk
 from tkinter import ttk, simpledialog, messagebox
 from tkcalendar import Calendar
-import threading
 import random
-from win10toast import ToastNotifier
+from plancalendar.event_store import (load_day, load_range, insert_event, insert_events,
+                                      update_event, delete_event as delete_stored_event,
+                                      insert_recurrence, update_recurrence, delete_recurrence,
+                                      add_recurrence_exception, detach_occurrence, ALL_DATES,
+                                      insert_check_item, set_check_item_done,
+                                      delete_check_item as delete_stored_check_item,
+                                      add_change_listener, remove_change_listener)
+from plancalendar.alarm_scheduler import start_default_scheduler
+from plancalendar.view_model import (date_colors, month_date_range, sorted_day_events,
+                                     event_display_text)
 
-toaster = ToastNotifier()
-
-DATA_FILE = "schedule_data.json"
 # 색상 선택지에 사용할 색상 리스트
 COLORS = ["blue", "green", "red", "orange", "purple", "brown", "gray", "cyan", "magenta"]
 
 
-def load_data():
-    if os.path.exists(DATA_FILE):
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
+def add_event_to_calendar(date: str, title: str, time: str = "", color: str = "blue", pinned: bool = False,
+                          location: str = "", outdoor: bool = False):
+    """
+    일정 한 건을 추가하고 새 일정의 id 를 반환합니다.
 
-def save_data(data):
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    :param location: 장소 (도시/시·군 이름). 야외 일정 날씨 알림에 사용됩니다.
+    :param outdoor: 야외 일정 여부
+    """
+    return insert_event(date, {
+        "title": title,
+        "time": time,
+        "color": color,
+        "pinned": pinned,
+        "location": location,
+        "outdoor": outdoor
+    })
 
-def add_event_to_calendar(date: str, title: str, time: str = "", color: str = "blue", pinned: bool = False):
-    data = load_data()
-    if date not in data:
-        data[date] = {"events": [], "checklist": []}
-    data[date]["events"].append({
+def add_events_to_calendar(events):
+    """
+    여러 일정을 한 번의 트랜잭션으로 추가합니다.
+
+    :param events: "date", "title" 와 선택적으로 "time", "color", "pinned", "location", "outdoor" 키를 가진 딕셔너리들의 iterable
+    :return: 입력 순서대로의 항목별 결과 리스트 ({"date", "title", "ok", "error", "id"})
+    """
+    results = []
+    valid = []
+    for item in events:
+        date = item.get("date", "")
+        title = (item.get("title") or "").strip()
+        result = {"date": date, "title": title, "ok": False, "error": "", "id": None}
+        try:
+            datetime.strptime(date, "%Y-%m-%d")
+        except (TypeError, ValueError):
+            result["error"] = f"잘못된 날짜 형식: {date}"
+        else:
+            if not title:
+                result["error"] = "일정 제목이 비어 있습니다."
+            else:
+                result["ok"] = True
+                valid.append((result, date, {
+                    "title": title,
+                    "time": item.get("time", ""),
+                    "color": item.get("color", "blue"),
+                    "pinned": item.get("pinned", False),
+                    "location": item.get("location", ""),
+                    "outdoor": item.get("outdoor", False)
+                }))
+        results.append(result)
+    if valid:
+        ids = insert_events((date, event) for _, date, event in valid)
+        for (result, _, _), event_id in zip(valid, ids):
+            result["id"] = event_id
+    return results
+
+def add_recurring_event_to_calendar(date: str, title: str, time: str = "", color: str = "blue", pinned: bool = False,
+                                    freq: str = "weekly", interval: int = 1, until: str = None, count: int = None,
+                                    location: str = "", outdoor: bool = False):
+    """
+    반복 일정을 규칙 하나로 저장하고 규칙 id 를 반환합니다. 회차는 조회하는 날짜 범위에서만 펼쳐집니다.
+
+    :param freq: "daily", "weekly", "monthly" 중 하나
+    :param until: 마지막 반복 날짜 ("YYYY-MM-DD", 포함). None 이면 기한 없음
+    :param count: 최대 반복 횟수 (date 회차 포함). None 이면 제한 없음
+    """
+    return insert_recurrence({
+        "start_date": date,
         "title": title,
         "time": time,
         "color": color,
-        "pinned": pinned
+        "pinned": pinned,
+        "location": location,
+        "outdoor": outdoor,
+        "freq": freq,
+        "interval": interval,
+        "until": until,
+        "count": count
     })
-    save_data(data)
 
 def check_alarms():
-    def alert_thread():
-        now = datetime.now()
-        data = load_data()
-        for date_str, content in data.items():
-            for event in content.get("events") or []:
-                event_time = event.get("time", "")
-                if event_time:
-                    try:
-                        date_time_str = f"{date_str} {event_time.split('~')[0].strip()}"
-                        event_dt = datetime.strptime(date_time_str, "%Y-%m-%d %H:%M")
-                        diff_sec = (event_dt - now).total_seconds()
-                        if 0 <= diff_sec <= 7200:
-                            toaster.show_toast("⏰ 임박한 일정!", f"{event['title']} - {date_time_str}", duration=10)
-                        elif 0 <= diff_sec <= 86400:
-                            toaster.show_toast("📅 다가오는 일정", f"{event['title']} - {date_time_str}", duration=10)
-                    except:
-                        pass
-    threading.Thread(target=alert_thread, daemon=True).start()
+    """다가오는 일정 알림 스케줄러를 (한 번만) 시작합니다."""
+    return start_default_scheduler()
 
 def launch_calendar_viewer():
     root = tk.Toplevel()
@@ -64,7 +107,30 @@ def launch_calendar_viewer():
     root.attributes("-topmost", True)
     root.after(500, lambda: root.attributes("-topmost", False))
 
-    data = load_data()
+    # 열어 본 날짜만 저장소에서 읽어 캐시합니다. (날짜 → {"events", "checklist"})
+    data = {}
+    # id → (날짜, 레코드) 인덱스. 리스트박스/체크리스트 행은 id 로 레코드를 찾습니다.
+    event_index = {}
+    check_index = {}
+
+    def get_day(date):
+        if date not in data:
+            data[date] = load_day(date)
+            for e in data[date]["events"]:
+                event_index[e["id"]] = (date, e)
+            for item in data[date]["checklist"]:
+                check_index[item["id"]] = (date, item)
+        return data[date]
+
+    def forget_days(dates):
+        for date in dates:
+            day = data.pop(date, None)
+            if day is None:
+                continue
+            for e in day["events"]:
+                event_index.pop(e["id"], None)
+            for item in day["checklist"]:
+                check_index.pop(item["id"], None)
 
     def get_selected_date():
         return cal.get_date()
@@ -73,7 +139,7 @@ def launch_calendar_viewer():
         dialog = tk.Toplevel(root)
         is_new_event = event_info is None
         dialog.title("일정 추가" if is_new_event else "일정 수정")
-        dialog.geometry("400x480")
+        dialog.geometry("400x620")
         dialog.resizable(False, False)
 
         result = {}
@@ -82,7 +148,10 @@ def launch_calendar_viewer():
         time_var = tk.StringVar(value=event_info.get('time', '') if event_info else "")
         color_var = tk.StringVar(value=event_info.get('color', COLORS[0]) if event_info else COLORS[0])
         pinned_var = tk.BooleanVar(value=event_info.get('pinned', False) if event_info else False)
+        location_var = tk.StringVar(value=event_info.get('location', '') if event_info else "")
+        outdoor_var = tk.BooleanVar(value=event_info.get('outdoor', False) if event_info else False)
         repeat_var = tk.BooleanVar(value=False)
+        repeat_until_var = tk.StringVar(value="")
 
         main_frame = ttk.Frame(dialog, padding="10")
         main_frame.pack(fill=tk.BOTH, expand=True)
@@ -93,6 +162,8 @@ def launch_calendar_viewer():
         ttk.Entry(info_frame, textvariable=title_var, width=40).grid(row=0, column=1, padx=5, pady=5)
         ttk.Label(info_frame, text="시간:").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
         ttk.Entry(info_frame, textvariable=time_var, width=40).grid(row=1, column=1, padx=5, pady=5)
+        ttk.Label(info_frame, text="장소:").grid(row=2, column=0, padx=5, pady=5, sticky=tk.W)
+        ttk.Entry(info_frame, textvariable=location_var, width=40).grid(row=2, column=1, padx=5, pady=5)
 
         color_frame = ttk.LabelFrame(main_frame, text="색상 선택 (하나만 선택 가능)")
         color_frame.pack(fill=tk.X, pady=5)
@@ -110,8 +181,13 @@ def launch_calendar_viewer():
         option_frame = ttk.LabelFrame(main_frame, text="추가 옵션")
         option_frame.pack(fill=tk.X, pady=10)
         ttk.Checkbutton(option_frame, text="📌 중요 일정으로 고정", variable=pinned_var).pack(anchor=tk.W, padx=5)
+        ttk.Checkbutton(option_frame, text="☂ 야외 일정 (장소의 비·강풍 예보 알림)", variable=outdoor_var).pack(anchor=tk.W, padx=5)
         if is_new_event:
             ttk.Checkbutton(option_frame, text="🔁 매주 반복", variable=repeat_var).pack(anchor=tk.W, padx=5)
+            until_frame = ttk.Frame(option_frame)
+            until_frame.pack(anchor=tk.W, padx=5, pady=(0, 5))
+            ttk.Label(until_frame, text="반복 종료일 (YYYY-MM-DD, 비우면 계속):").pack(side=tk.LEFT)
+            ttk.Entry(until_frame, textvariable=repeat_until_var, width=12).pack(side=tk.LEFT, padx=5)
 
         btn_frame = ttk.Frame(main_frame)
         btn_frame.pack(fill=tk.X, pady=10)
@@ -120,6 +196,13 @@ def launch_calendar_viewer():
             if not title_var.get().strip():
                 messagebox.showwarning("입력 오류", "일정 제목을 입력해야 합니다.", parent=dialog)
                 return
+            repeat_until = repeat_until_var.get().strip()
+            if repeat_var.get() and repeat_until:
+                try:
+                    datetime.strptime(repeat_until, "%Y-%m-%d")
+                except ValueError:
+                    messagebox.showwarning("입력 오류", "반복 종료일은 YYYY-MM-DD 형식이어야 합니다.", parent=dialog)
+                    return
             
             result.update({
                 "ok": True,
@@ -127,7 +210,10 @@ def launch_calendar_viewer():
                 "time": time_var.get(),
                 "color": color_var.get(),
                 "pinned": pinned_var.get(),
-                "repeat": repeat_var.get()
+                "location": location_var.get().strip(),
+                "outdoor": outdoor_var.get(),
+                "repeat": repeat_var.get(),
+                "repeat_until": repeat_until or None
             })
             dialog.destroy()
 
@@ -145,139 +231,214 @@ def launch_calendar_viewer():
         
         return result
 
-    def update_calendar_colors():
-        cal.calevent_remove('all')
-        defined_colors = set()
-        for date_str, content in data.items():
-            events = content.get("events", [])
-            if events:
-                target_event = next((e for e in events if e.get("pinned")), events[0])
-                color = target_event.get("color")
-                if color:
-                    try:
-                        date_obj = datetime.strptime(date_str, "%Y-%m-%d").date()
-                        color_tag = f"color_{color}"
-                        cal.calevent_create(date_obj, '', tags=[color_tag])
-                        if color not in defined_colors:
-                            cal.tag_config(color_tag, background=color)
-                            defined_colors.add(color)
-                    except Exception as e:
-                        print(f"Could not apply color '{color}' for {date_str}: {e}")
-
-    def refresh_all(event=None):
-        date = get_selected_date()
-        events = data.get(date, {}).get("events") or []
-        checklist = data.get(date, {}).get("checklist") or []
+    # 날짜 → 칠할 색 (일정이 없으면 None). 일정이 바뀐 날짜만 캐시에서 지웁니다.
+    color_cache = {}
+    # 달력에 현재 칠해진 날짜 → (색, calevent id)
+    applied_colors = {}
+    defined_colors = set()
+
+    def on_store_changed(dates):
+        # 저장소가 바뀐 날짜는 다음에 볼 때 다시 읽습니다.
+        if ALL_DATES in dates:
+            dates = list(data.keys())
+            color_cache.clear()
+        forget_days(dates)
+        for date_str in dates:
+            color_cache.pop(date_str, None)
+
+    add_change_listener(on_store_changed)
+    root.bind("<Destroy>", lambda e: remove_change_listener(on_store_changed) if e.widget is root else None)
+
+    def update_calendar_colors(event=None):
+        month, year = cal.get_displayed_month()
+        visible_dates = month_date_range(year, month)
+        missing = [d for d in visible_dates if d not in color_cache]
+        if missing:
+            color_cache.update(date_colors(load_range(missing[0], missing[-1]), missing))
+
+        wanted = {d: color_cache[d] for d in visible_dates if color_cache[d]}
+        for date_str, (color, ev_id) in list(applied_colors.items()):
+            if wanted.get(date_str) != color:
+                cal.calevent_remove(ev_id)
+                del applied_colors[date_str]
+        for date_str, color in wanted.items():
+            if date_str in applied_colors:
+                continue
+            try:
+                date_obj = datetime.strptime(date_str, "%Y-%m-%d").date()
+                color_tag = f"color_{color}"
+                ev_id = cal.calevent_create(date_obj, '', tags=[color_tag])
+                if color not in defined_colors:
+                    cal.tag_config(color_tag, background=color)
+                    defined_colors.add(color)
+                applied_colors[date_str] = (color, ev_id)
+            except Exception as e:
+                print(f"Could not apply color '{color}' for {date_str}: {e}")
+
+    # 체크리스트 행 위젯 풀. 행은 한 번 만들어 재사용하고, 남는 행은 숨겨 둡니다.
+    checklist_rows = []
+    check_rows_by_item = {}
+    # 리스트박스 행 번호 → 일정 id
+    listbox_event_ids = []
+
+    def get_check_row(idx):
+        while len(checklist_rows) <= idx:
+            row = {"item_id": None, "visible": False, "done": False}
+            row["frame"] = tk.Frame(checklist_frame)
+            row["var"] = tk.BooleanVar(value=False)
+            row["checkbutton"] = tk.Checkbutton(row["frame"], variable=row["var"],
+                                                command=lambda r=row: toggle_check_item(r["item_id"], r["var"]))
+            row["checkbutton"].pack(side=tk.LEFT, anchor="w")
+            row["delete_button"] = ttk.Button(row["frame"], text="삭제",
+                                              command=lambda r=row: delete_check_item(r["item_id"]))
+            checklist_rows.append(row)
+        return checklist_rows[idx]
+
+    def update_check_row(row, item):
+        if row["item_id"] != item["id"]:
+            check_rows_by_item.pop(row["item_id"], None)
+            row["item_id"] = item["id"]
+            check_rows_by_item[item["id"]] = row
+        row["checkbutton"].config(text=item["task"])
+        done = item.get("done", False)
+        row["var"].set(done)
+        if done and not row["done"]:
+            row["delete_button"].pack(side=tk.RIGHT, padx=5)
+        elif not done and row["done"]:
+            row["delete_button"].pack_forget()
+        row["done"] = done
+        if not row["visible"]:
+            row["frame"].pack(fill='x', expand=True, pady=2)
+            row["visible"] = True
+
+    def render_checklist(checklist):
+        for idx, item in enumerate(checklist):
+            update_check_row(get_check_row(idx), item)
+        for row in checklist_rows[len(checklist):]:
+            if row["visible"]:
+                row["frame"].pack_forget()
+                row["visible"] = False
+                check_rows_by_item.pop(row["item_id"], None)
+                row["item_id"] = None
+
+    def refresh_events(date):
+        events = get_day(date)["events"]
         event_listbox.delete(0, tk.END)
+        listbox_event_ids.clear()
         if not events:
             event_listbox.insert(tk.END, "🗓️ 등록된 일정이 없습니다.")
         else:
-            sorted_events = sorted(events, key=lambda e: (e.get("time", ""), e.get("title")))
-            for e in sorted_events:
-                mark = "📌 " if e.get("pinned") else ""
-                display = f"{mark}{e.get('title')} [{e.get('time', '시간 미지정')}]"
-                event_listbox.insert(tk.END, display)
-        checklist_frame_clear()
-        for idx, item in enumerate(checklist):
-            item_frame = tk.Frame(checklist_frame)
-            item_frame.pack(fill='x', expand=True, pady=2)
-            var = tk.BooleanVar(value=item.get("done", False))
-            cb = tk.Checkbutton(item_frame, text=item["task"], variable=var,
-                                command=lambda i=idx, v=var: toggle_check_item(get_selected_date(), i, v))
-            cb.pack(side=tk.LEFT, anchor="w")
-            if item.get("done", False):
-                delete_button = ttk.Button(item_frame, text="삭제",
-                                           command=lambda i=idx: delete_check_item(get_selected_date(), i))
-                delete_button.pack(side=tk.RIGHT, padx=5)
+            for e in sorted_day_events(events):
+                event_listbox.insert(tk.END, event_display_text(e))
+                listbox_event_ids.append(e["id"])
+
+    def refresh_all(event=None):
+        date = get_selected_date()
+        refresh_events(date)
+        render_checklist(get_day(date)["checklist"])
 
     def add_event():
         date = get_selected_date()
         dialog_result = open_event_dialog(date)
 
         if dialog_result.get("ok"):
-            add_event_to_calendar(date, dialog_result["title"], dialog_result["time"], dialog_result["color"], dialog_result["pinned"])
             if dialog_result.get("repeat"):
-                repeat_weekly(date, dialog_result["title"], dialog_result["time"], dialog_result["color"], dialog_result["pinned"])
-            data.clear()
-            data.update(load_data())
+                add_recurring_event_to_calendar(date, dialog_result["title"], dialog_result["time"], dialog_result["color"],
+                                                dialog_result["pinned"], freq="weekly", until=dialog_result["repeat_until"],
+                                                location=dialog_result["location"], outdoor=dialog_result["outdoor"])
+            else:
+                add_event_to_calendar(date, dialog_result["title"], dialog_result["time"], dialog_result["color"], dialog_result["pinned"],
+                                      location=dialog_result["location"], outdoor=dialog_result["outdoor"])
             refresh_all()
             update_calendar_colors()
 
-    def edit_event():
-        date = get_selected_date()
+    def get_selected_event_id():
         selected_indices = event_listbox.curselection()
-        if not selected_indices: return
-        idx = selected_indices[0]
-        sorted_events = sorted(data.get(date, {}).get("events", []), key=lambda e: (e.get("time", ""), e.get("title")))
-        if idx >= len(sorted_events): return
-        event_to_edit = sorted_events[idx]
-        original_event = next((e for e in data[date]["events"] if e == event_to_edit), None)
-        if not original_event: return
+        if not selected_indices or selected_indices[0] >= len(listbox_event_ids):
+            return None
+        return listbox_event_ids[selected_indices[0]]
+
+    def edit_event():
+        event_id = get_selected_event_id()
+        if event_id not in event_index: return
+        date, original_event = event_index[event_id]
+
+        rule_id = original_event.get("recurrence_id")
+        whole_series = False
+        if rule_id is not None:
+            answer = ask_series_scope("반복 일정 수정")
+            if answer is None: return
+            whole_series = answer
 
         dialog_result = open_event_dialog(date, event_info=original_event)
 
         if dialog_result.get("ok"):
-            original_event["title"] = dialog_result["title"]
-            original_event["time"] = dialog_result["time"]
-            original_event["color"] = dialog_result["color"]
-            original_event["pinned"] = dialog_result["pinned"]
-            save_data(data)
+            fields = {
+                "title": dialog_result["title"],
+                "time": dialog_result["time"],
+                "color": dialog_result["color"],
+                "pinned": dialog_result["pinned"],
+                "location": dialog_result["location"],
+                "outdoor": dialog_result["outdoor"]
+            }
+            if rule_id is None:
+                update_event(event_id, fields)
+            elif whole_series:
+                update_recurrence(rule_id, fields)
+            else:
+                # 이 회차만 바꾸는 경우: 규칙에서 제외하고 일반 일정으로 따로 저장합니다.
+                detach_occurrence(rule_id, date, fields)
             refresh_all()
             update_calendar_colors()
 
     def delete_event():
-        date = get_selected_date()
-        selected_indices = event_listbox.curselection()
-        if not selected_indices: return
-        idx = selected_indices[0]
-        sorted_events = sorted(data.get(date, {}).get("events", []), key=lambda e: (e.get("time", ""), e.get("title")))
-        if idx >= len(sorted_events): return
-        
-        event_to_delete = sorted_events[idx]
-        data[date]["events"].remove(event_to_delete)
-        if not data[date]["events"] and not data[date]["checklist"]:
-            del data[date]
-        save_data(data)
+        event_id = get_selected_event_id()
+        if event_id not in event_index: return
+        date, event_to_delete = event_index[event_id]
+        rule_id = event_to_delete.get("recurrence_id")
+        if rule_id is None:
+            delete_stored_event(event_id)
+        else:
+            whole_series = ask_series_scope("반복 일정 삭제")
+            if whole_series is None: return
+            if whole_series:
+                delete_recurrence(rule_id)
+            else:
+                add_recurrence_exception(rule_id, date)
         refresh_all()
         update_calendar_colors()
 
-    def repeat_weekly(date, title, time, color, pinned):
-        base_date = datetime.strptime(date, "%Y-%m-%d")
-        for i in range(1, 5):
-            next_date = (base_date + timedelta(weeks=i)).strftime("%Y-%m-%d")
-            add_event_to_calendar(next_date, title, time, color, pinned)
+    def ask_series_scope(title):
+        # True: 반복 전체, False: 이 날짜만, None: 취소
+        return messagebox.askyesnocancel(title, "반복되는 모든 일정에 적용할까요?\n(아니오: 이 날짜의 일정만)", parent=root)
 
     def add_check_item():
         date = get_selected_date()
         task = simpledialog.askstring("체크리스트", "할 일:", parent=root)
         if not task: return
-        if date not in data:
-            data[date] = {"events": [], "checklist": []}
-        data[date]["checklist"].append({"task": task, "done": False})
-        save_data(data)
-        refresh_all()
-
-    def toggle_check_item(date, index, var):
-        if date in data and index < len(data[date]["checklist"]):
-            data[date]["checklist"][index]["done"] = var.get()
-            save_data(data)
-            refresh_all()
-
-    def delete_check_item(date, index):
-        if date in data and index < len(data[date]["checklist"]):
-            del data[date]["checklist"][index]
-            save_data(data)
-            refresh_all()
-
-    def checklist_frame_clear():
-        for widget in checklist_frame.winfo_children():
-            widget.destroy()
+        insert_check_item(date, {"task": task, "done": False})
+        render_checklist(get_day(date)["checklist"])
+
+    def toggle_check_item(item_id, var):
+        if item_id not in check_index: return
+        date, _ = check_index[item_id]
+        set_check_item_done(item_id, var.get())
+        get_day(date)
+        if item_id in check_index and item_id in check_rows_by_item:
+            update_check_row(check_rows_by_item[item_id], check_index[item_id][1])
+
+    def delete_check_item(item_id):
+        if item_id not in check_index: return
+        date, _ = check_index[item_id]
+        delete_stored_check_item(item_id)
+        render_checklist(get_day(date)["checklist"])
 
     cal = Calendar(root, selectmode="day", date_pattern="yyyy-mm-dd",
                    year=datetime.now().year, month=datetime.now().month, day=datetime.now().day)
     # >>>>>>>> 수정된 부분: fill='both'와 expand=True 옵션 추가 <<<<<<<<
     cal.pack(pady=10, fill="both", expand=True, padx=10)
     cal.bind("<<CalendarSelected>>", refresh_all)
+    cal.bind("<<CalendarMonthChanged>>", update_calendar_colors)
 
     # 일정 리스트와 체크리스트는 창 크기가 변해도 세로로 늘어나지 않도록 expand=False (기본값) 유지
     event_listbox = tk.Listbox(root, width=80, height=10)
@@ -299,5 +460,3 @@ def launch_calendar_viewer():
     refresh_all()
     update_calendar_colors()
     root.mainloop()
-
-check_alarms()
\ No newline at end of file
@@ -0,0 +1,540 @@
+import json
+import os
+import shutil
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from plancalendar.recurrence import expand_rule, occurrence_event
+
+# 일정 데이터는 SQLite 파일에 날짜 인덱스와 함께 저장됩니다.
+# 기존 schedule_data.json 은 최초 실행 시 한 번만 자동으로 옮겨집니다.
+DB_FILE = "schedule_data.db"
+LEGACY_JSON_FILE = "schedule_data.json"
+
+# 변경 사항은 WAL(write-ahead log) 저널에 작은 레코드로 덧붙여지고, 열 때 자동으로 재생됩니다.
+# COMPACT_THRESHOLD 번 쓸 때마다 백그라운드에서 저널을 본 파일로 합치고(checkpoint)
+# 임시 파일 + 원자적 rename 으로 스냅샷을 남깁니다.
+SNAPSHOT_FILE = "schedule_data.snapshot.db"
+COMPACT_THRESHOLD = int(os.getenv("PLANMAN_COMPACT_THRESHOLD", "200"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    title TEXT NOT NULL,
+    time TEXT NOT NULL DEFAULT '',
+    color TEXT NOT NULL DEFAULT 'blue',
+    pinned INTEGER NOT NULL DEFAULT 0,
+    location TEXT NOT NULL DEFAULT '',
+    outdoor INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_events_date ON events(date);
+
+CREATE TABLE IF NOT EXISTS checklist (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    task TEXT NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_checklist_date ON checklist(date);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS recurrences (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    start_date TEXT NOT NULL,
+    title TEXT NOT NULL,
+    time TEXT NOT NULL DEFAULT '',
+    color TEXT NOT NULL DEFAULT 'blue',
+    pinned INTEGER NOT NULL DEFAULT 0,
+    location TEXT NOT NULL DEFAULT '',
+    outdoor INTEGER NOT NULL DEFAULT 0,
+    freq TEXT NOT NULL DEFAULT 'weekly',
+    interval INTEGER NOT NULL DEFAULT 1,
+    until TEXT,
+    count INTEGER,
+    exceptions TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS idx_recurrences_span ON recurrences(start_date, until);
+
+CREATE TABLE IF NOT EXISTS alarm_notified (
+    key TEXT PRIMARY KEY,
+    event_at TEXT NOT NULL
+);
+"""
+
+# 나중에 추가된 열들. 예전 버전에서 만든 DB 파일에는 열 때 ALTER TABLE 로 채워 넣습니다.
+_ADDED_COLUMNS = {
+    "events": [("location", "TEXT NOT NULL DEFAULT ''"), ("outdoor", "INTEGER NOT NULL DEFAULT 0")],
+    "recurrences": [("location", "TEXT NOT NULL DEFAULT ''"), ("outdoor", "INTEGER NOT NULL DEFAULT 0")],
+}
+
+# 0/1 로 저장되는 열
+_BOOL_COLUMNS = ("pinned", "outdoor")
+
+_conn = None
+_lock = threading.RLock()
+
+_writes_since_compact = 0
+_compact_requested = threading.Event()
+_compactor = None
+
+# 변경된 날짜를 알려받을 콜백들 (알림 스케줄러 등)
+# 반복 규칙처럼 날짜를 특정할 수 없는 변경은 ALL_DATES 로 알립니다.
+ALL_DATES = "*"
+_change_listeners = []
+_pending_changes = set()
+
+
+def _connect():
+    """공유 커넥션을 열고, 필요하면 스키마 생성과 JSON 마이그레이션을 수행합니다."""
+    global _conn
+    if _conn is None:
+        if not os.path.exists(DB_FILE) and os.path.exists(SNAPSHOT_FILE):
+            # 본 파일이 사라졌다면 마지막 스냅샷에서 복구합니다.
+            shutil.copyfile(SNAPSHOT_FILE, DB_FILE)
+        conn = sqlite3.connect(DB_FILE, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # 체크포인트는 UI 스레드가 아닌 압축 스레드에서만 수행합니다.
+        conn.execute("PRAGMA wal_autocheckpoint=0")
+        with conn:
+            conn.executescript(_SCHEMA)
+        _add_missing_columns(conn)
+        _migrate_legacy_json(conn)
+        _conn = conn
+        if os.path.exists(DB_FILE + "-wal") and os.path.getsize(DB_FILE + "-wal") > 0:
+            _request_compaction()
+    return _conn
+
+
+def close():
+    global _conn
+    with _lock:
+        if _conn is not None:
+            _conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            _conn.close()
+            _conn = None
+
+
+def set_compact_threshold(threshold):
+    """저널 압축 주기(쓰기 횟수)를 바꿉니다."""
+    global COMPACT_THRESHOLD
+    if threshold < 1:
+        raise ValueError("압축 기준은 1 이상이어야 합니다.")
+    COMPACT_THRESHOLD = threshold
+
+
+def add_change_listener(callback):
+    """쓰기가 커밋될 때마다 변경된 날짜 집합을 인자로 callback 을 호출합니다."""
+    if callback not in _change_listeners:
+        _change_listeners.append(callback)
+
+
+def remove_change_listener(callback):
+    if callback in _change_listeners:
+        _change_listeners.remove(callback)
+
+
+def _mark_changed(date):
+    _pending_changes.add(date)
+
+
+@contextmanager
+def _transaction():
+    """쓰기 트랜잭션. 커밋된 쓰기 횟수를 세어 기준을 넘으면 압축을 요청합니다."""
+    global _writes_since_compact
+    with _lock:
+        conn = _connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            changed = set(_pending_changes)
+            _pending_changes.clear()
+        _writes_since_compact += 1
+        if _writes_since_compact >= COMPACT_THRESHOLD:
+            _writes_since_compact = 0
+            _request_compaction()
+    if changed:
+        for callback in list(_change_listeners):
+            callback(changed)
+
+
+def _request_compaction():
+    global _compactor
+    if _compactor is None or not _compactor.is_alive():
+        _compactor = threading.Thread(target=_compactor_loop, daemon=True)
+        _compactor.start()
+    _compact_requested.set()
+
+
+def _compactor_loop():
+    while True:
+        _compact_requested.wait()
+        _compact_requested.clear()
+        try:
+            compact()
+        except (sqlite3.Error, OSError) as e:
+            print(f"일정 저널 압축 실패: {e}")
+
+
+def compact():
+    """
+    저널을 본 파일에 합치고 스냅샷을 원자적으로 교체합니다.
+    별도의 커넥션을 사용하므로 UI 쪽 읽기/쓰기를 막지 않습니다.
+    """
+    conn = sqlite3.connect(DB_FILE)
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        tmp_path = SNAPSHOT_FILE + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        snapshot = sqlite3.connect(tmp_path)
+        try:
+            conn.backup(snapshot)
+        finally:
+            snapshot.close()
+        os.replace(tmp_path, SNAPSHOT_FILE)
+    finally:
+        conn.close()
+
+
+def _add_missing_columns(conn):
+    for table, columns in _ADDED_COLUMNS.items():
+        existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+        with conn:
+            for name, definition in columns:
+                if name not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+
+def _migrate_legacy_json(conn):
+    migrated = conn.execute("SELECT value FROM meta WHERE key = 'legacy_json_migrated'").fetchone()
+    if migrated or not os.path.exists(LEGACY_JSON_FILE):
+        return
+    with open(LEGACY_JSON_FILE, "r", encoding="utf-8") as f:
+        legacy = json.load(f)
+    with conn:
+        for date, content in legacy.items():
+            _insert_day(conn, date, content)
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_json_migrated', ?)",
+                     (LEGACY_JSON_FILE,))
+    _pending_changes.clear()
+
+
+def _event_from_row(row):
+    return {
+        "id": row["id"],
+        "title": row["title"],
+        "time": row["time"],
+        "color": row["color"],
+        "pinned": bool(row["pinned"]),
+        "location": row["location"],
+        "outdoor": bool(row["outdoor"])
+    }
+
+
+def _check_item_from_row(row):
+    return {"id": row["id"], "task": row["task"], "done": bool(row["done"])}
+
+
+def _insert_event(conn, date, event):
+    if event.get("recurrence_id") is not None:
+        # 반복 규칙에서 펼쳐진 회차는 규칙으로만 저장됩니다.
+        return None
+    _mark_changed(date)
+    # id 가 이미 있는 레코드(다시 저장되는 날짜)는 같은 id 를 유지합니다.
+    cur = conn.execute(
+        "INSERT OR REPLACE INTO events (id, date, title, time, color, pinned, location, outdoor) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (event.get("id"), date, event.get("title", ""), event.get("time", "") or "",
+         event.get("color", "blue") or "blue", int(bool(event.get("pinned", False))),
+         event.get("location", "") or "", int(bool(event.get("outdoor", False))))
+    )
+    return cur.lastrowid
+
+
+def _insert_check_item(conn, date, item):
+    _mark_changed(date)
+    cur = conn.execute(
+        "INSERT OR REPLACE INTO checklist (id, date, task, done) VALUES (?, ?, ?, ?)",
+        (item.get("id"), date, item.get("task", ""), int(bool(item.get("done", False))))
+    )
+    return cur.lastrowid
+
+
+def _insert_day(conn, date, content):
+    for event in content.get("events") or []:
+        _insert_event(conn, date, event)
+    for item in content.get("checklist") or []:
+        _insert_check_item(conn, date, item)
+
+
+def _delete_day(conn, date):
+    _mark_changed(date)
+    conn.execute("DELETE FROM events WHERE date = ?", (date,))
+    conn.execute("DELETE FROM checklist WHERE date = ?", (date,))
+
+
+def _read_days(conn, where="", params=()):
+    data = {}
+    for row in conn.execute(f"SELECT * FROM events {where} ORDER BY date, id", params):
+        data.setdefault(row["date"], {"events": [], "checklist": []})["events"].append(_event_from_row(row))
+    for row in conn.execute(f"SELECT * FROM checklist {where} ORDER BY date, id", params):
+        data.setdefault(row["date"], {"events": [], "checklist": []})["checklist"].append(_check_item_from_row(row))
+    return data
+
+
+def _recurrence_from_row(row):
+    return {
+        "id": row["id"],
+        "start_date": row["start_date"],
+        "title": row["title"],
+        "time": row["time"],
+        "color": row["color"],
+        "pinned": bool(row["pinned"]),
+        "location": row["location"],
+        "outdoor": bool(row["outdoor"]),
+        "freq": row["freq"],
+        "interval": row["interval"],
+        "until": row["until"],
+        "count": row["count"],
+        "exceptions": json.loads(row["exceptions"])
+    }
+
+
+def _merge_occurrences(conn, data, start_date, end_date):
+    # 범위에 걸치는 규칙만 골라 그 범위만큼 펼칩니다.
+    rows = conn.execute(
+        "SELECT * FROM recurrences WHERE start_date <= ? AND (until IS NULL OR until >= ?) ORDER BY id",
+        (end_date, start_date)
+    )
+    for row in rows:
+        rule = _recurrence_from_row(row)
+        for date_str in expand_rule(rule, start_date, end_date):
+            data.setdefault(date_str, {"events": [], "checklist": []})["events"].append(occurrence_event(rule, date_str))
+    return data
+
+
+def load_data():
+    """
+    저장된 전체 일정을 {날짜: {"events": [...], "checklist": [...]}} 형태로 반환합니다.
+    반복 규칙은 기간이 정해지지 않을 수 있으므로 펼치지 않습니다. (load_range/load_day 사용)
+    """
+    with _lock:
+        return _read_days(_connect())
+
+
+def load_range(start_date, end_date):
+    """start_date ~ end_date (포함, "YYYY-MM-DD") 범위의 날짜만 날짜 인덱스로 읽고, 반복 일정을 펼쳐 넣습니다."""
+    with _lock:
+        conn = _connect()
+        data = _read_days(conn, "WHERE date BETWEEN ? AND ?", (start_date, end_date))
+        return _merge_occurrences(conn, data, start_date, end_date)
+
+
+def load_day(date):
+    return load_range(date, date).get(date, {"events": [], "checklist": []})
+
+
+def save_data(data):
+    """
+    전달된 전체 데이터와 저장소를 날짜 단위로 비교해, 달라진 날짜의 행만 다시 씁니다.
+    호환용 API이며, 단일 항목 변경에는 아래의 행 단위 함수를 사용하세요.
+    """
+    with _transaction() as conn:
+        stored = _read_days(conn)
+        for date in stored.keys() - data.keys():
+            _delete_day(conn, date)
+        for date, content in data.items():
+            if _normalize_day(stored.get(date, {})) != _normalize_day(content):
+                _delete_day(conn, date)
+                _insert_day(conn, date, content)
+
+
+def _normalize_day(content):
+    # 비교를 위해 같은 형태(id 제외, 기본값 채움, bool 변환)로 맞춥니다.
+    events = [{
+        "title": e.get("title", ""),
+        "time": e.get("time", "") or "",
+        "color": e.get("color", "blue") or "blue",
+        "pinned": bool(e.get("pinned", False)),
+        "location": e.get("location", "") or "",
+        "outdoor": bool(e.get("outdoor", False))
+    } for e in content.get("events") or [] if e.get("recurrence_id") is None]
+    checklist = [{"task": c.get("task", ""), "done": bool(c.get("done", False))}
+                 for c in content.get("checklist") or []]
+    return {"events": events, "checklist": checklist}
+
+
+def save_day(date, content):
+    """한 날짜의 일정/체크리스트만 교체합니다. 비어 있으면 해당 날짜를 삭제합니다."""
+    with _transaction() as conn:
+        _delete_day(conn, date)
+        if content:
+            _insert_day(conn, date, content)
+
+
+def insert_event(date, event):
+    with _transaction() as conn:
+        return _insert_event(conn, date, event)
+
+
+def insert_events(dated_events):
+    """(날짜, 일정) 쌍들을 하나의 트랜잭션으로 추가하고, 추가된 id 리스트를 반환합니다."""
+    with _transaction() as conn:
+        return [_insert_event(conn, date, event) for date, event in dated_events]
+
+
+def insert_check_item(date, item):
+    with _transaction() as conn:
+        return _insert_check_item(conn, date, item)
+
+
+def update_event(event_id, fields):
+    """id 로 일정 한 건의 title/time/color/pinned/location/outdoor 를 갱신합니다. 없으면 False."""
+    columns = [c for c in ("title", "time", "color", "pinned", "location", "outdoor") if c in fields]
+    if not columns:
+        return False
+    values = [int(bool(fields[c])) if c in _BOOL_COLUMNS else fields[c] for c in columns]
+    with _transaction() as conn:
+        row = conn.execute("SELECT date FROM events WHERE id = ?", (event_id,)).fetchone()
+        if row is None:
+            return False
+        conn.execute(f"UPDATE events SET {', '.join(c + ' = ?' for c in columns)} WHERE id = ?",
+                     (*values, event_id))
+        _mark_changed(row["date"])
+        return True
+
+
+def delete_event(event_id):
+    with _transaction() as conn:
+        row = conn.execute("SELECT date FROM events WHERE id = ?", (event_id,)).fetchone()
+        if row is None:
+            return False
+        conn.execute("DELETE FROM events WHERE id = ?", (event_id,))
+        _mark_changed(row["date"])
+        return True
+
+
+def set_check_item_done(item_id, done):
+    with _transaction() as conn:
+        row = conn.execute("SELECT date FROM checklist WHERE id = ?", (item_id,)).fetchone()
+        if row is None:
+            return False
+        conn.execute("UPDATE checklist SET done = ? WHERE id = ?", (int(bool(done)), item_id))
+        _mark_changed(row["date"])
+        return True
+
+
+def delete_check_item(item_id):
+    with _transaction() as conn:
+        row = conn.execute("SELECT date FROM checklist WHERE id = ?", (item_id,)).fetchone()
+        if row is None:
+            return False
+        conn.execute("DELETE FROM checklist WHERE id = ?", (item_id,))
+        _mark_changed(row["date"])
+        return True
+
+
+def insert_recurrence(rule):
+    """
+    반복 규칙을 한 행으로 저장하고 id 를 반환합니다.
+    rule: start_date, title 와 선택적으로 time, color, pinned, location, outdoor, freq, interval, until, count, exceptions
+    """
+    with _transaction() as conn:
+        cur = conn.execute(
+            "INSERT INTO recurrences (start_date, title, time, color, pinned, location, outdoor, "
+            "freq, interval, until, count, exceptions) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (rule["start_date"], rule.get("title", ""), rule.get("time", "") or "",
+             rule.get("color", "blue") or "blue", int(bool(rule.get("pinned", False))),
+             rule.get("location", "") or "", int(bool(rule.get("outdoor", False))),
+             rule.get("freq", "weekly"), int(rule.get("interval") or 1), rule.get("until") or None,
+             rule.get("count"), json.dumps(sorted(rule.get("exceptions") or [])))
+        )
+        _mark_changed(ALL_DATES)
+        return cur.lastrowid
+
+
+def load_recurrence(rule_id):
+    with _lock:
+        row = _connect().execute("SELECT * FROM recurrences WHERE id = ?", (rule_id,)).fetchone()
+    return _recurrence_from_row(row) if row else None
+
+
+def update_recurrence(rule_id, fields):
+    """반복 규칙 전체(모든 회차)의 title/time/color/pinned/location/outdoor/until/count 를 갱신합니다."""
+    columns = [c for c in ("title", "time", "color", "pinned", "location", "outdoor", "until", "count") if c in fields]
+    if not columns:
+        return False
+    values = [int(bool(fields[c])) if c in _BOOL_COLUMNS else fields[c] for c in columns]
+    with _transaction() as conn:
+        cur = conn.execute(f"UPDATE recurrences SET {', '.join(c + ' = ?' for c in columns)} WHERE id = ?",
+                           (*values, rule_id))
+        _mark_changed(ALL_DATES)
+        return cur.rowcount > 0
+
+
+def _add_recurrence_exception(conn, rule_id, date):
+    row = conn.execute("SELECT exceptions FROM recurrences WHERE id = ?", (rule_id,)).fetchone()
+    if row is None:
+        return False
+    exceptions = set(json.loads(row["exceptions"]))
+    exceptions.add(date)
+    conn.execute("UPDATE recurrences SET exceptions = ? WHERE id = ?", (json.dumps(sorted(exceptions)), rule_id))
+    _mark_changed(date)
+    return True
+
+
+def add_recurrence_exception(rule_id, date):
+    """반복 일정의 한 회차(date)만 건너뛰도록 예외로 등록합니다."""
+    with _transaction() as conn:
+        return _add_recurrence_exception(conn, rule_id, date)
+
+
+def detach_occurrence(rule_id, date, event):
+    """
+    반복 일정의 한 회차를 규칙에서 빼고 일반 일정(event)으로 따로 저장합니다.
+    둘은 하나의 트랜잭션으로 처리되어 중간에 실패해도 회차가 사라지지 않습니다.
+
+    :return: 새 일정의 id. 규칙이 없으면 None.
+    """
+    with _transaction() as conn:
+        if not _add_recurrence_exception(conn, rule_id, date):
+            return None
+        return _insert_event(conn, date, event)
+
+
+def delete_recurrence(rule_id):
+    with _transaction() as conn:
+        cur = conn.execute("DELETE FROM recurrences WHERE id = ?", (rule_id,))
+        _mark_changed(ALL_DATES)
+        return cur.rowcount > 0
+
+
+def load_notified_keys(since):
+    """since("YYYY-MM-DD HH:MM") 이후 일정에 대해 이미 보낸 알림 키 집합을 반환합니다."""
+    with _lock:
+        rows = _connect().execute("SELECT key FROM alarm_notified WHERE event_at >= ?", (since,)).fetchall()
+    return {row["key"] for row in rows}
+
+
+def mark_notified(key, event_at):
+    # 알림 기록은 일정 데이터가 아니므로 변경 알림/압축 카운트 없이 바로 씁니다.
+    with _lock:
+        conn = _connect()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO alarm_notified (key, event_at) VALUES (?, ?)", (key, event_at))
+
+
+def prune_notified(before):
+    with _lock:
+        conn = _connect()
+        with conn:
+            conn.execute("DELETE FROM alarm_notified WHERE event_at < ?", (before,))
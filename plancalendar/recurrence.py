@@ -0,0 +1,87 @@
+from datetime import date, datetime, timedelta
+
+# 반복 규칙은 한 번만 저장하고, 화면/알림에 필요한 날짜 범위만큼만 펼칩니다.
+# rule: {"start_date", "freq", "interval", "until", "count", "exceptions", ...}
+FREQUENCIES = {"daily": 1, "weekly": 7, "monthly": None}
+
+
+def _to_date(value):
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def occurrence_id(rule_id, date_str):
+    """반복 일정의 한 회차를 가리키는 id (일반 일정의 정수 id 와 겹치지 않는 문자열)."""
+    return f"r{rule_id}:{date_str}"
+
+
+def expand_rule(rule, range_start, range_end):
+    """
+    rule 이 range_start ~ range_end (포함) 사이에 만드는 날짜 문자열 리스트를 반환합니다.
+    범위 앞쪽 회차는 계산으로 건너뛰므로 비용은 시리즈 길이가 아니라 범위 크기에 비례합니다.
+    """
+    start = _to_date(rule["start_date"])
+    lo = max(start, _to_date(range_start))
+    hi = _to_date(range_end)
+    if rule.get("until"):
+        hi = min(hi, _to_date(rule["until"]))
+    if hi < lo:
+        return []
+
+    interval = max(1, int(rule.get("interval") or 1))
+    count = rule.get("count")
+    exceptions = set(rule.get("exceptions") or [])
+    freq = rule.get("freq", "weekly")
+    if freq not in FREQUENCIES:
+        raise ValueError(f"지원하지 않는 반복 주기: {freq}")
+
+    dates = []
+    if FREQUENCIES[freq]:
+        step = FREQUENCIES[freq] * interval
+        n = -(-(lo - start).days // step)  # lo 이상인 첫 회차 번호 (올림)
+        current = start + timedelta(days=n * step)
+        while current <= hi and (count is None or n < count):
+            date_str = current.strftime("%Y-%m-%d")
+            if date_str not in exceptions:
+                dates.append(date_str)
+            n += 1
+            current += timedelta(days=step)
+    else:
+        # 매월: 시작일과 같은 '일'에 반복하며, 그 날짜가 없는 달(예: 2월 30일)은 건너뜁니다.
+        # 건너뛴 달은 count 에 세지 않으므로, count 가 있으면 앞 회차를 계산으로 건너뛸 수 없습니다.
+        if count is None:
+            n = max(0, ((lo.year - start.year) * 12 + lo.month - start.month) // interval)
+        else:
+            n = 0
+        produced = 0
+        while count is None or produced < count:
+            year, month = divmod(start.month - 1 + n * interval, 12)
+            year += start.year
+            month += 1
+            if (year, month) > (hi.year, hi.month):
+                break
+            n += 1
+            try:
+                current = date(year, month, start.day)
+            except ValueError:
+                continue
+            produced += 1
+            if lo <= current <= hi:
+                date_str = current.strftime("%Y-%m-%d")
+                if date_str not in exceptions:
+                    dates.append(date_str)
+    return dates
+
+
+def occurrence_event(rule, date_str):
+    return {
+        "id": occurrence_id(rule["id"], date_str),
+        "recurrence_id": rule["id"],
+        "title": rule["title"],
+        "time": rule["time"],
+        "color": rule["color"],
+        "pinned": rule["pinned"],
+        "location": rule.get("location", ""),
+        "outdoor": rule.get("outdoor", False)
+    }
@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta
+
+# 캘린더 화면에 필요한 데이터 가공 함수들. tkinter 없이 동작하므로 벤치마크에서도 그대로 사용합니다.
+
+# 표시 중인 달 앞뒤로 함께 색칠할 날짜 수 (달력에 보이는 이전/다음 달 날짜)
+COLOR_MARGIN_DAYS = 7
+
+
+def day_color(events):
+    """날짜 칸에 칠할 색: 고정(📌) 일정의 색을 우선하고, 없으면 첫 일정의 색. 일정이 없으면 None."""
+    if not events:
+        return None
+    target_event = next((e for e in events if e.get("pinned")), events[0])
+    return target_event.get("color")
+
+
+def month_date_range(year, month, margin_days=COLOR_MARGIN_DAYS):
+    """year/month 달 전체와 앞뒤 margin_days 일의 날짜 문자열 리스트."""
+    first = datetime(year, month, 1)
+    next_first = (first + timedelta(days=32)).replace(day=1)
+    start = first - timedelta(days=margin_days)
+    end = next_first + timedelta(days=margin_days - 1)
+    return [(start + timedelta(days=i)).strftime("%Y-%m-%d") for i in range((end - start).days + 1)]
+
+
+def date_colors(days, dates):
+    """load_range 결과(days)에서 dates 각각의 칸 색을 계산합니다. 일정이 없는 날짜는 None."""
+    return {d: day_color(days.get(d, {}).get("events")) for d in dates}
+
+
+def sorted_day_events(events):
+    return sorted(events, key=lambda e: (e.get("time", ""), e.get("title")))
+
+
+def event_display_text(event):
+    mark = "📌 " if event.get("pinned") else ""
+    place = f" @{event['location']}" if event.get("location") else ""
+    outdoor = " ☂" if event.get("outdoor") else ""
+    return f"{mark}{event.get('title')} [{event.get('time', '시간 미지정')}]{place}{outdoor}"
@@ -0,0 +1,217 @@
+import os
+import threading
+from datetime import datetime, timedelta
+
+from plancalendar import event_store
+from plancalendar.alarm_scheduler import parse_event_datetime, show_toast
+from weather.weather_fetcher import PTY_CONDITION_MAP, get_kma_ultra_srt_fcst_tables_at, resolve_city_grid
+
+# 야외 일정 날씨 알림.
+# 앞으로 몇 시간 안의 야외 일정(장소가 있는 것)을 모아 장소의 격자별로 예보를 한 번씩만 받고,
+# 일정 시간에 비나 강풍이 겹치면 하나의 알림으로 묶어 보여줍니다.
+LOOKAHEAD_HOURS = 3
+CHECK_INTERVAL = timedelta(minutes=30)
+# 이 풍속(m/s) 이상이면 야외 일정에 영향을 주는 강풍으로 봅니다.
+STRONG_WIND_MS = 9.0
+# 끝나는 시간이 없는 일정은 이만큼 이어진다고 봅니다.
+DEFAULT_EVENT_DURATION = timedelta(hours=1)
+FORECAST_SLOT = timedelta(hours=1)
+ALERT_TITLE = "☔ 야외 일정 날씨 주의"
+# 일정 변경 알림을 받으면 이만큼 더 모았다가 한 번에 확인합니다.
+CHANGE_DEBOUNCE = timedelta(seconds=2)
+
+
+def event_time_range(date_str, time_str):
+    """일정의 (시작, 끝) datetime. 시간이 없거나 형식이 다르면 None."""
+    start = parse_event_datetime(date_str, time_str)
+    if start is None:
+        return None
+    end = None
+    if "~" in time_str:
+        end = parse_event_datetime(date_str, time_str.split("~", 1)[1])
+    if end is None or end <= start:
+        end = start + DEFAULT_EVENT_DURATION
+    return start, end
+
+
+def weather_hazards(values):
+    """예보 한 시각의 원본 값에서 야외 일정에 영향을 주는 항목들 (예: ["비", "강수 3.0mm", "강풍 11 m/s"])."""
+    hazards = []
+    pty = values.get("PTY")
+    if pty and pty != "0":
+        hazards.append(PTY_CONDITION_MAP.get(pty, pty))
+    rn1 = values.get("RN1")
+    if rn1 and rn1 not in ("강수없음", "0", "0.0"):
+        hazards.append(f"강수 {rn1}")
+    try:
+        if float(values.get("WSD", "")) >= STRONG_WIND_MS:
+            hazards.append(f"강풍 {values['WSD']} m/s")
+    except ValueError:
+        pass
+    return hazards
+
+
+def upcoming_outdoor_events(now, lookahead_hours=LOOKAHEAD_HOURS):
+    """now ~ now + lookahead_hours 에 걸치는 야외 일정들: [(날짜, 일정, 시작, 끝), ...]"""
+    window_end = now + timedelta(hours=lookahead_hours)
+    days = event_store.load_range(now.strftime("%Y-%m-%d"), window_end.strftime("%Y-%m-%d"))
+    upcoming = []
+    for date_str, day in sorted(days.items()):
+        for event in day["events"]:
+            if not event.get("outdoor") or not event.get("location"):
+                continue
+            time_range = event_time_range(date_str, event.get("time", ""))
+            if time_range and time_range[0] < window_end and time_range[1] > now:
+                upcoming.append((date_str, event, *time_range))
+    return upcoming
+
+
+def changes_affect_alerts(dates, now, lookahead_hours=LOOKAHEAD_HOURS):
+    """
+    바뀐 날짜들 중 확인 범위 안의 날짜에 장소나 야외 표시가 있는 일정이 있는지.
+    체크리스트나 장소 없는 일정만 바뀌었다면 다시 확인할 필요가 없습니다.
+    """
+    window_end = now + timedelta(hours=lookahead_hours)
+    first, last = now.strftime("%Y-%m-%d"), window_end.strftime("%Y-%m-%d")
+    if event_store.ALL_DATES not in dates:
+        dates = [d for d in dates if first <= d <= last]
+        if not dates:
+            return False
+        first, last = min(dates), max(dates)
+    days = event_store.load_range(first, last)
+    return any(event.get("location") or event.get("outdoor")
+               for day in days.values() for event in day["events"])
+
+
+def find_weather_conflicts(upcoming, fetch_tables=get_kma_ultra_srt_fcst_tables_at):
+    """
+    일정들과 예보를 격자 단위로 묶어 맞춰 봅니다. 격자마다 예보는 한 번만 가져옵니다.
+
+    :param upcoming: upcoming_outdoor_events 결과
+    :return: [{"date", "event", "start", "hazards"}, ...] 비/강풍이 겹치는 일정만
+    """
+    cells = {}
+    for entry in upcoming:
+        grid = resolve_city_grid(entry[1]["location"])
+        if grid:
+            cells.setdefault((grid["nx"], grid["ny"]), []).append(entry)
+    if not cells:
+        return []
+
+    tables = fetch_tables(cells)
+    conflicts = []
+    for cell, entries in cells.items():
+        table = tables.get(cell) or {}
+        if "error" in table:
+            continue
+        slots = [(datetime.strptime(h["fcst_date"] + h["fcst_time"], "%Y%m%d%H%M"), h["values"]) for h in table.get("hours", [])]
+        for date_str, event, start, end in entries:
+            hazards = []
+            for slot_start, values in slots:
+                if slot_start < end and slot_start + FORECAST_SLOT > start:
+                    hazards.extend(h for h in weather_hazards(values) if h not in hazards)
+            if hazards:
+                conflicts.append({"date": date_str, "event": event, "start": start, "hazards": hazards})
+    conflicts.sort(key=lambda c: c["start"])
+    return conflicts
+
+
+def conflict_key(conflict):
+    # 같은 일정에 같은 종류의 날씨 알림은 한 번만 보냅니다.
+    event = conflict["event"]
+    kinds = ",".join(sorted({h.split()[0] for h in conflict["hazards"]}))
+    return f"weather|{conflict['date']} {event.get('time', '')}|{event.get('title', '')}|{kinds}"
+
+
+class WeatherAlertJob:
+    """CHECK_INTERVAL 마다(일정이 바뀌면 곧바로) 다가오는 야외 일정의 날씨를 확인하는 백그라운드 작업."""
+
+    def __init__(self, notify, lookahead_hours=LOOKAHEAD_HOURS, interval=CHECK_INTERVAL):
+        self._notify = notify
+        self._lookahead_hours = lookahead_hours
+        self._interval = interval
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._changed_dates = set()
+        self._changes_lock = threading.Lock()
+        self._running = False
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        event_store.add_change_listener(self._on_store_changed)
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def stop(self):
+        self._running = False
+        event_store.remove_change_listener(self._on_store_changed)
+        self._stopped.set()
+        self._wakeup.set()
+
+    def _on_store_changed(self, dates):
+        # 쓰기하는 쪽(주로 UI 스레드)에서 불리므로 날짜만 모아 두고, 판단은 작업 스레드에서 합니다.
+        with self._changes_lock:
+            self._changed_dates |= dates
+        self._wakeup.set()
+
+    def _take_changed_dates(self):
+        with self._changes_lock:
+            dates, self._changed_dates = self._changed_dates, set()
+        return dates
+
+    def run_once(self, now=None):
+        """한 번 확인하고, 새로 알린 일정 수를 반환합니다."""
+        now = now or datetime.now()
+        conflicts = find_weather_conflicts(upcoming_outdoor_events(now, self._lookahead_hours))
+        notified = event_store.load_notified_keys(now.strftime("%Y-%m-%d 00:00"))
+        new_conflicts = [c for c in conflicts if conflict_key(c) not in notified]
+        if not new_conflicts:
+            return 0
+        lines = [f"{c['start'].strftime('%H:%M')} {c['event']['title']} @{c['event']['location']}: {', '.join(c['hazards'])}"
+                 for c in new_conflicts]
+        self._notify(ALERT_TITLE, "\n".join(lines))
+        for c in new_conflicts:
+            event_store.mark_notified(conflict_key(c), c["start"].strftime("%Y-%m-%d %H:%M"))
+        return len(new_conflicts)
+
+    def _run(self):
+        while self._running:
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"날씨 알림 확인 실패: {e}")
+            self._wait_for_next_check()
+
+    def _wait_for_next_check(self):
+        # CHECK_INTERVAL 이 지나거나, 알림에 영향을 주는 변경이 들어올 때까지 기다립니다.
+        deadline = datetime.now() + self._interval
+        while self._running:
+            remaining = (deadline - datetime.now()).total_seconds()
+            if remaining <= 0 or not self._wakeup.wait(timeout=remaining):
+                return
+            self._wakeup.clear()
+            # 연달아 들어오는 쓰기는 잠깐 모아서 한 번만 봅니다.
+            if self._stopped.wait(CHANGE_DEBOUNCE.total_seconds()):
+                return
+            self._wakeup.clear()
+            try:
+                if changes_affect_alerts(self._take_changed_dates(), datetime.now(), self._lookahead_hours):
+                    return
+            except Exception as e:
+                print(f"날씨 알림 변경 확인 실패: {e}")
+                return
+
+
+_default_job = None
+
+
+def start_default_weather_alerts():
+    """KMA_API_KEY 가 있으면 토스트로 알리는 기본 작업을 (한 번만) 시작합니다."""
+    global _default_job
+    if not os.getenv("KMA_API_KEY"):
+        return None
+    if _default_job is None:
+        _default_job = WeatherAlertJob(show_toast)
+        _default_job.start()
+    return _default_job
@@ -0,0 +1,30 @@
+import pytest
+
+from plancalendar import event_store
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    event_store.close()
+    yield event_store
+    event_store.close()
+
+
+def test_detach_occurrence_is_one_transaction(store):
+    rule_id = store.insert_recurrence({"start_date": "2026-03-02", "title": "스터디", "freq": "weekly", "count": 3})
+    changes = []
+    store.add_change_listener(changes.append)
+    try:
+        event_id = store.detach_occurrence(rule_id, "2026-03-09", {"title": "스터디 (장소 변경)", "location": "수원"})
+    finally:
+        store.remove_change_listener(changes.append)
+    assert event_id is not None
+    assert changes == [{"2026-03-09"}]
+    events = store.load_day("2026-03-09")["events"]
+    assert [(e["title"], e.get("recurrence_id")) for e in events] == [("스터디 (장소 변경)", None)]
+
+
+def test_detach_occurrence_unknown_rule(store):
+    assert store.detach_occurrence(999, "2026-03-09", {"title": "x"}) is None
+    assert store.load_day("2026-03-09")["events"] == []
@@ -0,0 +1,37 @@
+from exam_ai.offline_planner import format_plan_text, plan_study_schedule
+
+
+def subject(name, date, workload="보통", category="교양"):
+    return {"subject": name, "date": date, "category": category, "workload": workload}
+
+
+def blocks_on(plan, date, name):
+    return [item for item in plan["items"] if item["date"] == date and item["subject"] == name]
+
+
+def test_review_day_leaves_capacity_for_other_subjects():
+    subjects = [subject("영어", "2026-01-04"), subject("수학", "2026-01-08", workload="많음")]
+    plan = plan_study_schedule(subjects, "2026-01-01", daily_capacity=3, existing_load={})
+    assert blocks_on(plan, "2026-01-03", "영어")[0]["title"] == "영어 전범위 복습"
+    # 영어 복습일에도 남는 블록은 수학에 배정됩니다.
+    assert blocks_on(plan, "2026-01-03", "수학")[0]["title"] == "수학 학습 (2블록)"
+
+
+def test_review_day_respects_existing_load():
+    subjects = [subject("영어", "2026-01-03"), subject("수학", "2026-01-08")]
+    plan = plan_study_schedule(subjects, "2026-01-01", daily_capacity=3, existing_load={"2026-01-02": 2})
+    assert blocks_on(plan, "2026-01-02", "영어")
+    assert not blocks_on(plan, "2026-01-02", "수학")
+
+
+def test_exam_on_or_before_start_is_reported():
+    subjects = [subject("국어", "2026-01-01"), subject("과학", "2025-12-30"), subject("수학", "2026-01-05")]
+    plan = plan_study_schedule(subjects, "2026-01-01", existing_load={})
+    assert plan["skipped"] == ["국어", "과학"]
+    assert not any(item["subject"] in ("국어", "과학") for item in plan["items"])
+    assert "국어, 과학" in format_plan_text(plan)
+
+
+def test_only_past_exams():
+    plan = plan_study_schedule([subject("국어", "2025-12-31")], "2026-01-01", existing_load={})
+    assert plan == {"items": [], "unscheduled": {}, "skipped": ["국어"]}
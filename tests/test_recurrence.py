@@ -0,0 +1,17 @@
+from plancalendar.recurrence import expand_rule
+
+
+def test_monthly_count_skips_missing_days_without_using_up_count():
+    rule = {"start_date": "2026-01-31", "freq": "monthly", "count": 6}
+    assert expand_rule(rule, "2026-01-01", "2027-12-31") == [
+        "2026-01-31", "2026-03-31", "2026-05-31", "2026-07-31", "2026-08-31", "2026-10-31"]
+
+
+def test_monthly_count_with_range_starting_later():
+    rule = {"start_date": "2026-01-31", "freq": "monthly", "count": 6}
+    assert expand_rule(rule, "2026-06-01", "2027-12-31") == ["2026-07-31", "2026-08-31", "2026-10-31"]
+
+
+def test_monthly_without_count_uses_range():
+    rule = {"start_date": "2026-01-31", "freq": "monthly"}
+    assert expand_rule(rule, "2030-04-01", "2030-06-30") == ["2030-05-31"]
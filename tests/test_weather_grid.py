@@ -0,0 +1,22 @@
+from weather.weather_fetcher import CITY_COORDINATES, resolve_city_grid
+
+# 기상청이 공개한 기본 도시 격자
+PUBLISHED_GRIDS = {
+    "서울": (60, 127), "부산": (98, 76), "대구": (89, 90), "인천": (55, 124), "광주": (58, 74),
+    "대전": (67, 100), "울산": (102, 84), "수원": (60, 121), "제주": (52, 38),
+}
+
+
+def test_default_cities_use_published_grid():
+    assert {name: (c["nx"], c["ny"]) for name, c in CITY_COORDINATES.items()} == PUBLISHED_GRIDS
+    for name, (nx, ny) in PUBLISHED_GRIDS.items():
+        assert resolve_city_grid(name) == {"nx": nx, "ny": ny}
+
+
+def test_aliases_resolve_to_published_grid():
+    for alias, name in [("수원시", "수원"), ("대구광역시", "대구"), ("제주시", "제주"), ("서울특별시", "서울")]:
+        assert resolve_city_grid(alias) == resolve_city_grid(name)
+
+
+def test_unknown_name():
+    assert resolve_city_grid("없는도시") is None
@@ -1,14 +1,24 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from news.news_viewer import get_news_items_by_category
-from plancalendar.calendar_planman import launch_calendar_viewer, add_event_to_calendar
-from tkcalendar import DateEntry
-from exam_ai.exam_scheduler_ai import generate_exam_plan, extract_schedule_from_plan
-from weather.weather_fetcher import get_kma_ultra_srt_fcst_data, CITY_COORDINATES
 import os
+import queue
+import threading
+import time
 from datetime import datetime, timedelta
+from ui.startup_timing import timed_import, mark, print_report
+
+# 기능 모듈(뉴스, 캘린더, AI, 날씨)은 무거운 의존성을 끌어오므로 버튼을 처음 누를 때 불러옵니다.
 
 CATEGORIES = ["정치", "경제", "사회·문화", "산업·과학", "세계"]
+# 뉴스 창이 수집기의 새 기사 알림을 확인하는 주기(ms)
+NEWS_POLL_MS = 200
+# 날씨 대시보드에 보여줄 예보 시각 수와 결과 확인 주기(ms)
+WEATHER_DASHBOARD_HOURS = 6
+WEATHER_POLL_MS = 50
+# 공부 계획 생성 결과(스트리밍 조각)를 확인하는 주기(ms)
+EXAM_STREAM_POLL_MS = 50
+# 도시 선택을 바꾼 뒤 이 시간(ms) 동안 다른 선택이 없으면 요청을 보냅니다.
+WEATHER_DEBOUNCE_MS = 300
 
 def raise_topmost(win):
     win.attributes("-topmost", True)
@@ -16,47 +26,109 @@ def raise_topmost(win):
     win.after(0, lambda: win.attributes("-topmost", False))
 
 def on_schedule_click():
-    launch_calendar_viewer()
+    timed_import("plancalendar.calendar_planman").launch_calendar_viewer()
 
 def on_news_click():
+    news_viewer = timed_import("news.news_viewer")
+    aggregator = news_viewer.start_background_news()
+
     news_window = tk.Toplevel()
     news_window.title("카테고리별 뉴스 보기")
     news_window.geometry("800x600")
     raise_topmost(news_window)
 
     tab_control = ttk.Notebook(news_window)
+    listboxes = {}
+    tab_items = {}
+
+    def make_open_article_function(local_items):
+        def open_article(event):
+            index = event.widget.curselection()
+            if index:
+                actual_index = index[0] // 2
+                if actual_index < len(local_items):
+                    url = local_items[actual_index]['link']
+                    if url:
+                        import webbrowser
+                        webbrowser.open(url)
+        return open_article
+
+    def fill_tab(category):
+        # 수집기가 메모리에 들고 있는 기사를 바로 보여줍니다. 아직 첫 수집 전이면 "불러오는 중" 으로 둡니다.
+        items = aggregator.get_items(category, limit=news_viewer.NEWS_LIMIT)
+        if not items:
+            error = aggregator.get_error(category)
+            if error:
+                items = [{"title": f"❌ 뉴스 로드 실패: {error}", "link": ""}]
+            elif aggregator.is_ready(category):
+                items = [{"title": "❌ 뉴스 없음", "link": ""}]
+            else:
+                items = [{"title": "⏳ 뉴스를 불러오는 중...", "link": ""}]
+        tab_items[category][:] = items
+        listbox = listboxes[category]
+        listbox.delete(0, tk.END)
+        for item in items:
+            listbox.insert(tk.END, item['title'])
+            listbox.insert(tk.END, "")
 
     for category in CATEGORIES:
         frame = ttk.Frame(tab_control)
         tab_control.add(frame, text=category)
 
-        items = get_news_items_by_category(category)
-
         listbox = tk.Listbox(frame, font=("Arial", 13), height=20)
         listbox.pack(padx=10, pady=0, fill=tk.BOTH, expand=True)
 
-        for item in items:
-            listbox.insert(tk.END, item['title'])
-            listbox.insert(tk.END, "")
+        tab_items[category] = []
+        listboxes[category] = listbox
+        listbox.bind("<Double-Button-1>", make_open_article_function(tab_items[category]))
+        fill_tab(category)
+
+    tab_control.pack(expand=True, fill="both")
 
-        def make_open_article_function(local_items):
-            def open_article(event):
-                index = event.widget.curselection()
-                if index:
-                    actual_index = index[0] // 2
-                    if actual_index < len(local_items):
-                        url = local_items[actual_index]['link']
-                        if url:
-                            import webbrowser
-                            webbrowser.open(url)
-            return open_article
+    # 새 기사 알림은 수집 스레드에서 오므로 큐에 담아 두고 Tk 쪽에서 주기적으로 꺼내 반영합니다.
+    updated = queue.Queue()
 
-        listbox.bind("<Double-Button-1>", make_open_article_function(items))
+    def on_new_items(category, new_items):
+        updated.put(category)
 
-    tab_control.pack(expand=True, fill="both")
+    def poll_updates():
+        if not news_window.winfo_exists():
+            return
+        categories = set()
+        try:
+            while True:
+                categories.add(updated.get_nowait())
+        except queue.Empty:
+            pass
+        for category in categories & set(listboxes):
+            fill_tab(category)
+        news_window.after(NEWS_POLL_MS, poll_updates)
+
+    def selected_category():
+        return tab_control.tab(tab_control.select(), "text")
+
+    def on_tab_changed(event):
+        category = selected_category()
+        if not aggregator.is_ready(category):
+            aggregator.poll_now(category)
+        fill_tab(category)
+
+    def on_destroy(event):
+        if event.widget is news_window:
+            aggregator.unsubscribe(on_new_items)
+
+    aggregator.subscribe(on_new_items)
+    news_window.bind("<Destroy>", on_destroy)
+    tab_control.bind("<<NotebookTabChanged>>", on_tab_changed)
+    news_window.after(NEWS_POLL_MS, poll_updates)
 
 
 def on_exam_plan_click():
+    DateEntry = timed_import("tkcalendar").DateEntry
+    exam_ai = timed_import("exam_ai.exam_scheduler_ai")
+    stream_exam_plan, get_cached_plan = exam_ai.stream_exam_plan, exam_ai.get_cached_plan
+    PlanRecordStream, plan_records, format_plan_records = exam_ai.PlanRecordStream, exam_ai.plan_records, exam_ai.format_plan_records
+    add_events_to_calendar = timed_import("plancalendar.calendar_planman").add_events_to_calendar
     exam_data_list = []
 
     def refresh_subject_list():
@@ -97,22 +169,72 @@ def on_exam_plan_click():
         subject_entry.delete(0, tk.END)
         refresh_subject_list()
 
-    def generate_plan():
+    def add_schedule_to_calendar(schedule_list, result_window):
+        if not schedule_list:
+            messagebox.showinfo("정보", "추출된 일정이 없습니다.", parent=result_window)
+            return
+        try:
+            results = add_events_to_calendar(
+                {"date": item['date'], "title": item['title'], "time": "18:00 ~ 20:00"}
+                for item in schedule_list
+            )
+            added = sum(1 for r in results if r["ok"])
+            failed = [r for r in results if not r["ok"]]
+            message = f"{added}개의 일정이 캘린더에 추가되었습니다."
+            if failed:
+                message += f"\n\n추가하지 못한 항목 {len(failed)}개:\n" + "\n".join(
+                    f"- {r['date']} {r['title']}: {r['error']}" for r in failed[:10])
+            messagebox.showinfo("완료", message, parent=result_window)
+            result_window.destroy() 
+            popup.destroy()
+        except Exception as e:
+            messagebox.showerror("캘린더 추가 오류", f"일정 추가 중 오류 발생: {str(e)}", parent=result_window)
+
+    def generate_offline_plan():
+        # 네트워크·API 키 없이 로컬에서 바로 계획을 만듭니다.
         if not exam_data_list:
             messagebox.showwarning("입력 부족", "최소 한 과목 이상 추가해주세요.", parent=popup)
             return
-            
+        offline_planner = timed_import("exam_ai.offline_planner")
         start_date = start_date_entry.get_date().strftime('%Y-%m-%d')
-            
         try:
-            plan_text = generate_exam_plan(exam_data_list, start_date)
-            if "❌ AI 계획 생성 실패" in plan_text or "환경변수가 설정되지 않았습니다." in plan_text :
-                 messagebox.showerror("오류", plan_text, parent=popup)
-                 return
+            plan = offline_planner.plan_study_schedule(exam_data_list, start_date)
+        except ValueError as e:
+            messagebox.showerror("오류", f"계획 생성 중 오류 발생: {str(e)}", parent=popup)
+            return
 
-        except Exception as e:
-            messagebox.showerror("오류", f"계획 생성 중 예외 발생: {str(e)}", parent=popup)
+        result_window = tk.Toplevel(popup)
+        result_window.title("공부 계획 결과 (오프라인)")
+        result_window.geometry("600x500")
+        raise_topmost(result_window)
+
+        button_frame = ttk.Frame(result_window)
+        button_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=10, padx=10)
+        text_frame = ttk.Frame(result_window)
+        text_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True, pady=(10, 0), padx=10)
+        scrollbar = ttk.Scrollbar(text_frame)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        text_area = tk.Text(text_frame, wrap=tk.WORD, font=("Arial", 12), yscrollcommand=scrollbar.set)
+        text_area.insert(tk.END, offline_planner.format_plan_text(plan) or "배정할 공부 일정이 없습니다.")
+        text_area.config(state=tk.DISABLED)
+        text_area.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.config(command=text_area.yview)
+
+        def confirm_add_to_calendar():
+            if messagebox.askyesno("일정 반영", "공부 계획을 캘린더에 반영할까요?", parent=result_window):
+                add_schedule_to_calendar(plan["items"], result_window)
+
+        ttk.Button(button_frame, text="캘린더에 반영", command=confirm_add_to_calendar).pack()
+
+    def generate_plan():
+        if not exam_data_list:
+            messagebox.showwarning("입력 부족", "최소 한 과목 이상 추가해주세요.", parent=popup)
             return
+            
+        start_date = start_date_entry.get_date().strftime('%Y-%m-%d')
+        subjects = [dict(s) for s in exam_data_list]
+        # 과목별로 나눠 동시에 요청할지 (과목이 많을 때 빠르고, 한 과목이 실패해도 나머지는 남습니다)
+        generate_parallel_plan = timed_import("exam_ai.parallel_planner").generate_parallel_plan if parallel_var.get() else None
 
         result_window = tk.Toplevel(popup)
         result_window.title("공부 계획 결과")
@@ -121,6 +243,9 @@ def on_exam_plan_click():
 
         button_frame = ttk.Frame(result_window)
         button_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=10, padx=10)
+
+        status_label = ttk.Label(result_window, text="⏳ AI가 계획을 생성하는 중...", anchor="w")
+        status_label.pack(side=tk.BOTTOM, fill=tk.X, padx=10)
         
         text_frame = ttk.Frame(result_window)
         text_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True, pady=(10, 0), padx=10)
@@ -129,32 +254,178 @@ def on_exam_plan_click():
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
         text_area = tk.Text(text_frame, wrap=tk.WORD, font=("Arial", 12), yscrollcommand=scrollbar.set)
-        text_area.insert(tk.END, plan_text)
         text_area.config(state=tk.DISABLED)
         text_area.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         scrollbar.config(command=text_area.yview)
 
-        def confirm_add_to_calendar(p_text):
-            if messagebox.askyesno("일정 반영", "AI가 생성한 공부 계획을 캘린더에 반영할까요?", parent=result_window):
-                schedule_list = extract_schedule_from_plan(p_text)
-                if not schedule_list:
-                    messagebox.showinfo("정보", "추출된 일정이 없습니다.", parent=result_window)
+        # 생성은 작업자 스레드에서 스트리밍(JSON)으로 받고, 완성된 항목만 큐를 거쳐 Tk 쪽에서 날짜별로 이어 붙입니다.
+        # "다시 생성" 을 누르면 이전 실행은 취소하고 새 실행(run)으로 바꿉니다.
+        plan_parts = []
+        shown = {"last_date": None, "records": []}
+        run = {}
+
+        def final_records(record_stream, text):
+            # 스트리밍 중에 읽은 항목이 있으면 그것을 씁니다 (끊긴 응답이면 완성된 앞부분만).
+            # 하나도 못 읽었으면 원문에서 다시 뽑는데, 정규식 추출은 예전 형식(자유 글) 계획에만 쓰입니다.
+            # :return: (일정 목록, 사용자에게 보여줄 경고 또는 None)
+            if record_stream.records:
+                if record_stream.complete:
+                    return record_stream.records, None
+                return record_stream.records, "\n⚠ 계획이 중간에 끊겨 완성된 항목까지만 반영합니다. '다시 생성'으로 새로 받을 수 있습니다.\n"
+            try:
+                return plan_records(text, subjects, start_date), None
+            except ValueError as e:
+                return [], f"\n⚠ {e}\n"
+
+        def parallel_worker(current, regenerate):
+            # 병렬 생성은 스트리밍하지 않으므로 '첫 응답' 대신 첫 묶음이 끝난 시간을 잽니다.
+            def on_progress(done, total):
+                if current["first_batch"] is None:
+                    current["first_batch"] = time.perf_counter() - current["started_at"]
+                current["chunks"].put(("progress", f"⏳ 과목별로 생성하는 중... ({done}/{total})"))
+
+            try:
+                result = generate_parallel_plan(subjects, start_date, regenerate=regenerate,
+                                                cancel_event=current["cancel"], on_progress=on_progress)
+            except Exception as e:
+                current["chunks"].put(("error", f"❌ AI 계획 생성 실패: {str(e)}"))
+                return
+            if result["failed"] and not result["records"]:
+                current["chunks"].put(("error", "❌ AI 계획 생성 실패: " + "; ".join(result["failed"].values())))
+                return
+            current["chunks"].put(("chunk", ("", result["records"])))
+            for label, error in result["failed"].items():
+                current["chunks"].put(("notice", f"\n⚠ {label}: 계획을 만들지 못했습니다 ({error})\n"))
+            current["chunks"].put(("done", (None, result["records"], None)))
+
+        def generation_worker(current, regenerate):
+            if generate_parallel_plan is not None:
+                parallel_worker(current, regenerate)
+                return
+            record_stream = PlanRecordStream(subjects, start_date)
+            cached = None if regenerate else get_cached_plan(subjects, start_date)
+            if cached is not None:
+                current["first_token"] = time.perf_counter() - current["started_at"]
+                current["chunks"].put(("chunk", (cached, record_stream.feed(cached))))
+                put_final(current, "cached", record_stream, cached)
+                return
+            parts = []
+            try:
+                for text in stream_exam_plan(subjects, start_date, current["cancel"]):
+                    if current["first_token"] is None:
+                        current["first_token"] = time.perf_counter() - current["started_at"]
+                    parts.append(text)
+                    current["chunks"].put(("chunk", (text, record_stream.feed(text))))
+            except Exception as e:
+                current["chunks"].put(("error", f"❌ AI 계획 생성 실패: {str(e)}"))
+                return
+            put_final(current, None, record_stream, "".join(parts))
+
+        def put_final(current, source, record_stream, text):
+            current["chunks"].put(("done", (source, *final_records(record_stream, text))))
+
+        def start_generation(regenerate=False):
+            if run:
+                run["cancel"].set()
+            current = {"cancel": threading.Event(), "chunks": queue.Queue(),
+                       "started_at": time.perf_counter(), "first_token": None, "first_batch": None}
+            run.clear()
+            run.update(current)
+            plan_parts.clear()
+            shown.update(last_date=None, records=[])
+            text_area.config(state=tk.NORMAL)
+            text_area.delete("1.0", tk.END)
+            text_area.config(state=tk.DISABLED)
+            add_button.config(state=tk.DISABLED)
+            regenerate_button.config(state=tk.DISABLED)
+            cancel_button.config(state=tk.NORMAL)
+            status_label.config(text="⏳ AI가 계획을 생성하는 중...")
+            threading.Thread(target=generation_worker, args=(current, regenerate), daemon=True).start()
+            result_window.after(EXAM_STREAM_POLL_MS, poll_chunks, current)
+
+        def append_text(text):
+            text_area.config(state=tk.NORMAL)
+            text_area.insert(tk.END, text)
+            text_area.config(state=tk.DISABLED)
+            text_area.see(tk.END)
+
+        def timing_text(current):
+            if generate_parallel_plan is not None:
+                first = current["first_batch"]
+                first_text = f"첫 묶음 완료 {first:.2f}초" if first is not None else "완료된 묶음 없음"
+            else:
+                first = current["first_token"]
+                first_text = f"첫 응답 {first:.2f}초" if first is not None else "첫 응답 없음"
+            return f"{first_text} / 전체 {time.perf_counter() - current['started_at']:.2f}초"
+
+        def poll_chunks(current):
+            if not result_window.winfo_exists() or run.get("cancel") is not current["cancel"]:
+                return
+            if current["cancel"].is_set():
+                # 이미 보낸 요청은 작업자 스레드가 다음 조각에서 멈추고, 그 뒤 결과는 버립니다.
+                cancel_button.config(state=tk.DISABLED)
+                regenerate_button.config(state=tk.NORMAL)
+                status_label.config(text=f"⏹ 생성 취소됨 ({timing_text(current)})")
+                return
+            try:
+                while True:
+                    kind, payload = current["chunks"].get_nowait()
+                    if kind == "chunk":
+                        text, new_records = payload
+                        plan_parts.append(text)
+                        if new_records:
+                            append_text(format_plan_records(new_records, shown["last_date"]))
+                            shown["last_date"] = new_records[-1]["date"]
+                        continue
+                    if kind == "progress":
+                        status_label.config(text=payload)
+                        continue
+                    if kind == "notice":
+                        append_text(payload)
+                        continue
+                    cancel_button.config(state=tk.DISABLED)
+                    regenerate_button.config(state=tk.NORMAL)
+                    if kind == "error":
+                        status_label.config(text=payload)
+                        return
+                    source, shown["records"], warning = payload
+                    if shown["last_date"] is None:
+                        # 스트리밍 중에 항목을 하나도 못 읽었으면 다시 뽑은 결과(없으면 원문)를 보여줍니다.
+                        append_text(format_plan_records(shown["records"]) or "".join(plan_parts).strip())
+                    if warning:
+                        append_text(warning)
+                    if source == "cached":
+                        status_label.config(text="💾 저장된 계획을 불러왔습니다. 새로 만들려면 '다시 생성'을 누르세요.")
+                        add_button.config(state=tk.NORMAL)
+                    else:
+                        status_label.config(text=f"✅ 생성 완료 ({timing_text(current)})")
+                        add_button.config(state=tk.NORMAL)
                     return
-                try:
-                    for item in schedule_list:
-                        add_event_to_calendar(item['date'], item['title'], time="18:00 ~ 20:00")
-                    messagebox.showinfo("완료", f"{len(schedule_list)}개의 일정이 캘린더에 추가되었습니다.", parent=result_window)
-                    result_window.destroy() 
-                    popup.destroy()
-                except Exception as e:
-                    messagebox.showerror("캘린더 추가 오류", f"일정 추가 중 오류 발생: {str(e)}", parent=result_window)
-
-        ttk.Button(button_frame, text="캘린더에 반영", command=lambda p=plan_text: confirm_add_to_calendar(p)).pack()
+            except queue.Empty:
+                pass
+            if current["first_token"] is None and current["first_batch"] is None:
+                status_label.config(text=f"⏳ AI가 계획을 생성하는 중... ({time.perf_counter() - current['started_at']:.1f}초)")
+            result_window.after(EXAM_STREAM_POLL_MS, poll_chunks, current)
+
+        def confirm_add_to_calendar():
+            if messagebox.askyesno("일정 반영", "AI가 생성한 공부 계획을 캘린더에 반영할까요?", parent=result_window):
+                add_schedule_to_calendar(shown["records"], result_window)
+
+        add_button = ttk.Button(button_frame, text="캘린더에 반영", command=confirm_add_to_calendar, state=tk.DISABLED)
+        add_button.pack(side=tk.RIGHT)
+        cancel_button = ttk.Button(button_frame, text="생성 취소", command=lambda: run["cancel"].set())
+        cancel_button.pack(side=tk.RIGHT, padx=5)
+        regenerate_button = ttk.Button(button_frame, text="🔄 다시 생성", command=lambda: start_generation(regenerate=True))
+        regenerate_button.pack(side=tk.LEFT)
+        # 결과 창을 닫으면 생성도 멈춥니다.
+        result_window.bind("<Destroy>", lambda e: run["cancel"].set() if e.widget is result_window else None)
+
+        start_generation()
     
     popup = tk.Toplevel()
     popup.title("📘 시험 과목 입력")
-    popup.geometry("400x600")
+    popup.geometry("400x670")
     raise_topmost(popup)
 
     input_frame = ttk.Frame(popup, padding="10")
@@ -201,7 +472,10 @@ def on_exam_plan_click():
 
     bottom_frame = ttk.Frame(popup, padding="10")
     bottom_frame.pack(side='bottom', fill='x')
+    parallel_var = tk.BooleanVar(value=False)
+    ttk.Checkbutton(bottom_frame, text="과목별로 나눠 동시에 생성", variable=parallel_var).pack(pady=(0, 5))
     ttk.Button(bottom_frame, text="📝 계획 생성", command=generate_plan, width=25).pack()
+    ttk.Button(bottom_frame, text="⚡ 오프라인 계획 (빠름)", command=generate_offline_plan, width=25).pack(pady=(5, 0))
 
 
 def on_weather_click():
@@ -214,18 +488,23 @@ def on_weather_click():
                                "예시 (Linux/macOS 터미널):\nexport KMA_API_KEY=\"발급받은인증키\"")
         return
 
+    weather_fetcher = timed_import("weather.weather_fetcher")
+    get_kma_ultra_srt_fcst_data, CITY_COORDINATES = weather_fetcher.get_kma_ultra_srt_fcst_data, weather_fetcher.CITY_COORDINATES
+    get_kma_ultra_srt_fcst_tables = weather_fetcher.get_kma_ultra_srt_fcst_tables
+
     weather_window = tk.Toplevel()
     weather_window.title("날씨 정보 (기상청 초단기 예보)")
-    weather_window.geometry("500x550")
+    weather_window.geometry("500x700")
     raise_topmost(weather_window)
 
-    tk.Label(weather_window, text="도시를 선택하세요:").pack(pady=(10,0))
+    tk.Label(weather_window, text="도시를 선택하거나 입력하세요:").pack(pady=(10,0))
 
     city_entry_frame = tk.Frame(weather_window)
     city_entry_frame.pack(pady=5)
 
     available_cities = list(CITY_COORDINATES.keys())
-    city_combobox = ttk.Combobox(city_entry_frame, values=available_cities, width=15, state="readonly")
+    # 목록에 없는 시·군 이름도 직접 입력할 수 있습니다 (지역 색인에서 좌표를 찾습니다).
+    city_combobox = ttk.Combobox(city_entry_frame, values=available_cities, width=15)
     if available_cities:
         city_combobox.set(available_cities[0])
     city_combobox.pack(side=tk.LEFT)
@@ -242,6 +521,7 @@ def on_weather_click():
         "precipitation_form": tk.Label(result_frame, text="", font=("Arial", 12), wraplength=480, anchor="w", justify="left"),
         "precipitation_1h": tk.Label(result_frame, text="", font=("Arial", 12), wraplength=480, anchor="w", justify="left"),
         "wind_speed": tk.Label(result_frame, text="", font=("Arial", 12), wraplength=480, anchor="w", justify="left"),
+        "hourly": tk.Label(result_frame, text="", font=("Arial", 11), wraplength=480, anchor="w", justify="left"),
         "error": tk.Label(result_frame, text="", fg="red", font=("Arial", 11), wraplength=480, anchor="w", justify="left")
     }
     weather_display_labels["city"].pack(pady=3, fill="x")
@@ -252,10 +532,49 @@ def on_weather_click():
     weather_display_labels["precipitation_form"].pack(pady=3, fill="x")
     weather_display_labels["precipitation_1h"].pack(pady=3, fill="x")
     weather_display_labels["wind_speed"].pack(pady=3, fill="x")
+    weather_display_labels["hourly"].pack(pady=(10, 3), fill="x")
     weather_display_labels["error"].pack(pady=3, fill="x")
 
-    def fetch_and_display_weather():
-        city_name = city_combobox.get()
+    # 날씨 요청은 작업자 스레드 하나가 처리합니다. 요청마다 번호를 매겨 가장 최근 요청만 실행하고,
+    # 이미 보낸 요청이라도 그 사이 새 선택이 있었다면 결과를 버립니다.
+    weather_request = {"seq": 0, "pending": None, "debounce": None}
+    weather_request_lock = threading.Lock()
+    weather_request_ready = threading.Event()
+    weather_results = queue.Queue()
+
+    def weather_worker():
+        while True:
+            weather_request_ready.wait()
+            with weather_request_lock:
+                weather_request_ready.clear()
+                pending, weather_request["pending"] = weather_request["pending"], None
+            if pending is None:
+                continue
+            seq, city_name = pending
+            if seq < 0:
+                return
+            weather_results.put((seq, city_name, get_kma_ultra_srt_fcst_data(city_name)))
+
+    def poll_weather_results():
+        if not weather_window.winfo_exists():
+            return
+        try:
+            while True:
+                seq, city_name, weather_data = weather_results.get_nowait()
+                if seq == weather_request["seq"]:
+                    display_weather(city_name, weather_data)
+        except queue.Empty:
+            pass
+        weather_window.after(WEATHER_POLL_MS, poll_weather_results)
+
+    def submit_weather_request(seq, city_name):
+        weather_request["debounce"] = None
+        with weather_request_lock:
+            weather_request["pending"] = (seq, city_name)
+        weather_request_ready.set()
+
+    def fetch_and_display_weather(debounce_ms=0):
+        city_name = city_combobox.get().strip()
         if not city_name:
             messagebox.showwarning("선택 필요", "도시를 선택해주세요.", parent=weather_window)
             return
@@ -263,10 +582,20 @@ def on_weather_click():
         for key in weather_display_labels:
             weather_display_labels[key].config(text="")
         weather_display_labels["error"].config(text="날씨 정보 로딩 중...")
-        weather_window.update_idletasks()
 
-        weather_data = get_kma_ultra_srt_fcst_data(city_name) 
+        # 도시를 빠르게 바꾸면 마지막 선택만 요청하도록, 예약해 둔 요청을 취소하고 다시 예약합니다.
+        weather_request["seq"] += 1
+        if weather_request["debounce"] is not None:
+            weather_window.after_cancel(weather_request["debounce"])
+        weather_request["debounce"] = weather_window.after(debounce_ms, submit_weather_request, weather_request["seq"], city_name)
+
+    def on_weather_window_destroy(event):
+        if event.widget is weather_window:
+            with weather_request_lock:
+                weather_request["pending"] = (-1, None)
+            weather_request_ready.set()
 
+    def display_weather(city_name, weather_data):
         if "error" in weather_data:
             weather_display_labels["error"].config(text=f"오류: {weather_data['error']}")
             for key in weather_display_labels:
@@ -281,10 +610,61 @@ def on_weather_click():
             weather_display_labels["precipitation_form"].config(text=f"🌧️ 강수 형태: {weather_data.get('precipitation_form', 'N/A')}")
             weather_display_labels["precipitation_1h"].config(text=f"💧 1시간 강수량: {weather_data.get('precipitation_1h', 'N/A')}")
             weather_display_labels["wind_speed"].config(text=f"💨 풍속: {weather_data.get('wind_speed', 'N/A')}")
+            hourly_lines = [f"{h['fcst_time'][:2]}시  {h['temperature']}  {h['sky_condition']}  {h['precipitation_1h']}"
+                            for h in weather_data.get("hours", [])]
+            weather_display_labels["hourly"].config(text="🕒 시간별 예보\n" + "\n".join(hourly_lines) if hourly_lines else "")
             weather_display_labels["humidity"].pack_forget()
 
+    def open_weather_dashboard():
+        # 전체 도시의 시간별 예보를 한 표로 보여줍니다. 도시별 요청은 동시에 보내고, 결과는 Tk 쪽에서 받아 그립니다.
+        dashboard = tk.Toplevel(weather_window)
+        dashboard.title("전체 도시 시간별 예보")
+        dashboard.geometry("900x330")
+        status_label = tk.Label(dashboard, text="날씨 정보 로딩 중...", font=("Arial", 11))
+        status_label.pack(pady=5)
+        tree = ttk.Treeview(dashboard, columns=[f"h{i}" for i in range(WEATHER_DASHBOARD_HOURS)], height=len(available_cities))
+        tree.heading("#0", text="도시")
+        tree.column("#0", width=90, anchor="w")
+        for i in range(WEATHER_DASHBOARD_HOURS):
+            tree.heading(f"h{i}", text="")
+            tree.column(f"h{i}", width=130, anchor="center")
+        tree.pack(fill="both", expand=True, padx=10, pady=5)
+
+        results = queue.Queue()
+        threading.Thread(target=lambda: results.put(get_kma_ultra_srt_fcst_tables(available_cities)), daemon=True).start()
+
+        def show_results():
+            if not dashboard.winfo_exists():
+                return
+            try:
+                forecasts = results.get_nowait()
+            except queue.Empty:
+                dashboard.after(WEATHER_POLL_MS, show_results)
+                return
+            errors = 0
+            for city, forecast in forecasts.items():
+                if "error" in forecast:
+                    errors += 1
+                    tree.insert("", tk.END, text=city, values=["오류"] + [""] * (WEATHER_DASHBOARD_HOURS - 1))
+                    continue
+                hours = forecast["hours"][:WEATHER_DASHBOARD_HOURS]
+                for i, hour in enumerate(hours):
+                    tree.heading(f"h{i}", text=f"{hour['fcst_time'][:2]}:{hour['fcst_time'][2:]}")
+                tree.insert("", tk.END, text=city,
+                            values=[f"{h['temperature']} {h['sky_condition']}" for h in hours])
+            status_label.config(text=f"오류 {errors}개 도시" if errors else "")
+
+        dashboard.after(WEATHER_POLL_MS, show_results)
+
+    threading.Thread(target=weather_worker, daemon=True).start()
+    weather_window.bind("<Destroy>", on_weather_window_destroy)
+    weather_window.after(WEATHER_POLL_MS, poll_weather_results)
+    city_combobox.bind("<<ComboboxSelected>>", lambda event: fetch_and_display_weather(WEATHER_DEBOUNCE_MS))
+    city_combobox.bind("<Return>", lambda event: fetch_and_display_weather())
+
     fetch_button = tk.Button(weather_window, text="날씨 가져오기", command=fetch_and_display_weather, font=("Arial", 12))
     fetch_button.pack(pady=10)
+    tk.Button(weather_window, text="전체 도시 보기", command=open_weather_dashboard, font=("Arial", 11)).pack()
 
     if city_combobox.get():
         fetch_and_display_weather()
@@ -311,4 +691,19 @@ def launch_main_gui():
     for btn in [btn1, btn2, btn3, btn4, btn5]:
         btn.pack(pady=5)
 
+    def on_first_window_shown():
+        mark("첫 창 표시")
+        print_report()
+        # 알림 스케줄러와 뉴스 수집기는 첫 창이 뜬 뒤에 시작합니다.
+        timed_import("plancalendar.alarm_scheduler").start_default_scheduler()
+        timed_import("news.news_viewer").start_background_news()
+        # 즐겨찾는 도시가 설정돼 있으면 발표 직후마다 날씨를 미리 받아 둡니다.
+        if os.getenv("PLANMAN_WEATHER_FAVORITES"):
+            timed_import("weather.forecast_prefetcher").start_default_prefetcher()
+        # 야외 일정 날씨 알림은 기상청 키가 있을 때만 켭니다.
+        if os.getenv("KMA_API_KEY"):
+            timed_import("plancalendar.weather_alerts").start_default_weather_alerts()
+
+    mark("메인 창 구성 완료")
+    root.after_idle(on_first_window_shown)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,50 @@
+import importlib
+import os
+import sys
+import time
+
+# 시작 시간 측정. main.py 가 가장 먼저 import 하므로 이 시각을 프로세스 시작점으로 봅니다.
+# PLANMAN_STARTUP_REPORT=1 환경 변수나 --startup-report 인자로 실행하면 결과를 출력합니다.
+START = time.perf_counter()
+ENABLED = os.getenv("PLANMAN_STARTUP_REPORT") == "1" or "--startup-report" in sys.argv
+
+_import_costs = []  # (모듈 이름, 초)
+_marks = []  # (이름, 시작 후 경과 초)
+
+
+def timed_import(module_name):
+    """모듈을 import 하면서, 처음 불러오는 경우 걸린 시간을 기록합니다."""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    t0 = time.perf_counter()
+    module = importlib.import_module(module_name)
+    elapsed = time.perf_counter() - t0
+    _import_costs.append((module_name, elapsed))
+    if ENABLED and _marks:
+        # 첫 창 이후(버튼 클릭 시)의 지연 로딩은 그때그때 출력합니다.
+        print(f"[startup] import {module_name}: {elapsed * 1000:.1f} ms")
+    return module
+
+
+def mark(name):
+    _marks.append((name, time.perf_counter() - START))
+
+
+def get_report():
+    return {
+        "imports": [{"module": name, "ms": round(sec * 1000, 1)} for name, sec in _import_costs],
+        "marks": [{"name": name, "ms": round(sec * 1000, 1)} for name, sec in _marks]
+    }
+
+
+def print_report():
+    if not ENABLED:
+        return
+    print("=" * 40)
+    print("Plan Man 시작 시간 보고서")
+    print("-" * 40)
+    for name, sec in sorted(_import_costs, key=lambda x: x[1], reverse=True):
+        print(f"  import {name:<32} {sec * 1000:8.1f} ms")
+    for name, sec in _marks:
+        print(f"  {name:<39} {sec * 1000:8.1f} ms")
+    print("=" * 40)
@@ -0,0 +1,104 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# 기상청 초단기 예보 캐시.
+# 같은 격자점(nx, ny)·같은 발표 시각(base_date, base_time)의 예보는 바뀌지 않으므로
+# 메모리 LRU 와 디스크에 저장해 두고, 다음 발표 시각의 자료가 나올 때(expires_at)까지 재사용합니다.
+CACHE_DIR = "weather_cache"
+MEMORY_CACHE_SIZE = 64
+# 디스크에 남은 만료 항목은 이 시간이 지나면 지웁니다.
+DISK_RETENTION_SECONDS = 6 * 60 * 60
+
+_memory = OrderedDict()  # (nx, ny, base_date, base_time) → {"items", "expires_at"}
+_lock = threading.Lock()
+_stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+
+def get_cache_stats():
+    """메모리 적중/디스크 적중/미스 횟수."""
+    with _lock:
+        return dict(_stats)
+
+
+def reset_cache_stats():
+    with _lock:
+        for key in _stats:
+            _stats[key] = 0
+
+
+def _cache_path(key):
+    nx, ny, base_date, base_time = key
+    return os.path.join(CACHE_DIR, f"{nx}_{ny}_{base_date}_{base_time}.json")
+
+
+def _remember(key, entry):
+    # 호출하는 쪽에서 _lock 을 잡고 있어야 합니다.
+    _memory[key] = entry
+    _memory.move_to_end(key)
+    while len(_memory) > MEMORY_CACHE_SIZE:
+        _memory.popitem(last=False)
+
+
+def get_forecast(nx, ny, base_date, base_time, now=None):
+    """캐시된 예보 항목 리스트. 없거나 만료됐으면 None."""
+    key = (nx, ny, base_date, base_time)
+    now = time.time() if now is None else now
+    with _lock:
+        entry = _memory.get(key)
+        if entry is not None:
+            if entry["expires_at"] > now:
+                _memory.move_to_end(key)
+                _stats["memory_hits"] += 1
+                return entry["items"]
+            del _memory[key]
+
+    try:
+        with open(_cache_path(key), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        entry = None
+    with _lock:
+        if entry is not None and entry.get("expires_at", 0) > now:
+            _remember(key, entry)
+            _stats["disk_hits"] += 1
+            return entry["items"]
+        _stats["misses"] += 1
+    return None
+
+
+def put_forecast(nx, ny, base_date, base_time, items, expires_at):
+    """예보 항목을 expires_at(유닉스 시각)까지 유효하게 저장합니다."""
+    key = (nx, ny, base_date, base_time)
+    entry = {"items": items, "expires_at": expires_at}
+    with _lock:
+        _remember(key, entry)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        path = _cache_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        _prune_disk()
+    except OSError as e:
+        print(f"날씨 캐시 저장 실패: {e}")
+
+
+def _prune_disk():
+    cutoff = time.time() - DISK_RETENTION_SECONDS
+    for name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def clear():
+    """메모리 캐시를 비웁니다 (디스크 파일은 남겨 둡니다)."""
+    with _lock:
+        _memory.clear()
@@ -0,0 +1,59 @@
+import os
+import threading
+from datetime import datetime, timedelta
+
+from weather.weather_fetcher import get_kma_ultra_srt_fcst_tables, next_publication_at, resolve_city_grid
+
+# 즐겨찾는 도시의 초단기 예보를 발표 직후 미리 받아 캐시를 채워 두는 스케줄러.
+# 즐겨찾기는 PLANMAN_WEATHER_FAVORITES 환경 변수에 쉼표로 구분해 적습니다. (예: "서울,수원")
+FAVORITES_ENV = "PLANMAN_WEATHER_FAVORITES"
+# 발표 직후엔 서버 반영이 늦을 수 있어 조금 기다렸다가 받습니다.
+PREFETCH_MARGIN = timedelta(minutes=1)
+
+
+def favorite_cities():
+    names = [name.strip() for name in os.getenv(FAVORITES_ENV, "").split(",")]
+    return [name for name in names if name and resolve_city_grid(name)]
+
+
+class ForecastPrefetcher:
+    def __init__(self, city_names):
+        self.city_names = list(city_names)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def prefetch(self):
+        """즐겨찾는 도시들의 예보를 지금 받아 캐시에 넣습니다. 오류가 난 도시 수를 반환합니다."""
+        results = get_kma_ultra_srt_fcst_tables(self.city_names)
+        return sum(1 for forecast in results.values() if "error" in forecast)
+
+    def _run(self):
+        while not self._stop.is_set():
+            failed = self.prefetch()
+            if failed:
+                print(f"날씨 미리 받기 실패: {failed}개 도시")
+            wake_at = next_publication_at(datetime.now()) + PREFETCH_MARGIN
+            self._stop.wait(max((wake_at - datetime.now()).total_seconds(), 1))
+
+
+_default_prefetcher = None
+
+
+def start_default_prefetcher():
+    """즐겨찾기와 KMA_API_KEY 가 설정돼 있으면 공용 스케줄러를 시작합니다."""
+    global _default_prefetcher
+    cities = favorite_cities()
+    if not cities or not os.getenv("KMA_API_KEY"):
+        return None
+    if _default_prefetcher is None:
+        _default_prefetcher = ForecastPrefetcher(cities)
+        _default_prefetcher.start()
+    return _default_prefetcher
@@ -0,0 +1,68 @@
+import math
+
+# 기상청 동네예보 격자 변환 (Lambert Conformal Conic, 5km 격자).
+# 기상청이 공개한 변환식의 상수를 그대로 쓰며, 투영 상수는 모듈을 불러올 때 한 번만 계산합니다.
+EARTH_RADIUS_KM = 6371.00877
+GRID_KM = 5.0
+STANDARD_LAT1 = 30.0
+STANDARD_LAT2 = 60.0
+ORIGIN_LON = 126.0
+ORIGIN_LAT = 38.0
+ORIGIN_X = 43
+ORIGIN_Y = 136
+
+_DEGRAD = math.pi / 180.0
+
+
+def _projection_constants():
+    re = EARTH_RADIUS_KM / GRID_KM
+    slat1 = STANDARD_LAT1 * _DEGRAD
+    slat2 = STANDARD_LAT2 * _DEGRAD
+    olat = ORIGIN_LAT * _DEGRAD
+    sn = math.log(math.cos(slat1) / math.cos(slat2)) / math.log(
+        math.tan(math.pi * 0.25 + slat2 * 0.5) / math.tan(math.pi * 0.25 + slat1 * 0.5))
+    sf = math.tan(math.pi * 0.25 + slat1 * 0.5) ** sn * math.cos(slat1) / sn
+    ro = re * sf / math.tan(math.pi * 0.25 + olat * 0.5) ** sn
+    return re * sf, sn, ro
+
+
+_RE_SF, _SN, _RO = _projection_constants()
+
+
+def latlon_to_grid_many(coords):
+    """
+    [(위도, 경도), ...] 를 한 번에 기상청 격자 [(nx, ny), ...] 로 바꿉니다.
+    수천 개를 변환해도 투영 상수는 다시 계산하지 않습니다.
+    """
+    tan, sin, cos, floor, pi = math.tan, math.sin, math.cos, math.floor, math.pi
+    re_sf, sn, ro = _RE_SF, _SN, _RO
+    olon = ORIGIN_LON * _DEGRAD
+    grid = []
+    for lat, lon in coords:
+        ra = re_sf / tan(pi * 0.25 + lat * _DEGRAD * 0.5) ** sn
+        theta = lon * _DEGRAD - olon
+        if theta > pi:
+            theta -= 2.0 * pi
+        elif theta < -pi:
+            theta += 2.0 * pi
+        theta *= sn
+        grid.append((int(floor(ra * sin(theta) + ORIGIN_X + 0.5)),
+                     int(floor(ro - ra * cos(theta) + ORIGIN_Y + 0.5))))
+    return grid
+
+
+def latlon_to_grid(lat, lon):
+    """위도/경도 → 기상청 격자 (nx, ny). 예: 서울시청 (37.5665, 126.978) → (60, 127)"""
+    return latlon_to_grid_many([(lat, lon)])[0]
+
+
+def group_by_grid(coords):
+    """
+    같은 격자에 들어가는 좌표들을 묶습니다. 격자마다 예보를 한 번만 요청하면 됩니다.
+
+    :return: {(nx, ny): [coords 안의 인덱스, ...]}
+    """
+    groups = {}
+    for index, cell in enumerate(latlon_to_grid_many(coords)):
+        groups.setdefault(cell, []).append(index)
+    return groups
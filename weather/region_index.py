@@ -0,0 +1,122 @@
+import math
+
+from weather.kma_grid import latlon_to_grid_many
+
+# 시·도 및 주요 시 청사 위치 (위도, 경도).
+# 이름으로 좌표를 찾거나, 임의 좌표에서 가장 가까운 지역 이름을 찾는 데 씁니다.
+KOREA_REGIONS = {
+    "서울": (37.5665, 126.9780), "부산": (35.1796, 129.0756), "대구": (35.8714, 128.6014),
+    "인천": (37.4563, 126.7052), "광주": (35.1595, 126.8526), "대전": (36.3504, 127.3845),
+    "울산": (35.5384, 129.3114), "세종": (36.4800, 127.2890),
+    # 경기
+    "수원": (37.2636, 127.0286), "성남": (37.4201, 127.1265), "고양": (37.6584, 126.8320),
+    "용인": (37.2411, 127.1776), "부천": (37.5034, 126.7660), "안산": (37.3219, 126.8309),
+    "안양": (37.3943, 126.9568), "남양주": (37.6360, 127.2165), "화성": (37.1995, 126.8312),
+    "평택": (36.9921, 127.1129), "의정부": (37.7381, 127.0337), "파주": (37.7600, 126.7800),
+    "김포": (37.6153, 126.7156), "광명": (37.4786, 126.8646), "시흥": (37.3800, 126.8029),
+    "군포": (37.3617, 126.9352), "하남": (37.5393, 127.2149), "오산": (37.1499, 127.0775),
+    "이천": (37.2720, 127.4350), "안성": (37.0080, 127.2797), "구리": (37.5943, 127.1296),
+    "포천": (37.8949, 127.2003), "양주": (37.7853, 127.0458),
+    # 강원
+    "춘천": (37.8813, 127.7298), "원주": (37.3422, 127.9202), "강릉": (37.7519, 128.8761),
+    "속초": (38.2070, 128.5918), "동해": (37.5247, 129.1143),
+    # 충청
+    "청주": (36.6424, 127.4890), "충주": (36.9910, 127.9259), "제천": (37.1326, 128.1910),
+    "천안": (36.8151, 127.1139), "아산": (36.7898, 127.0018), "공주": (36.4465, 127.1190),
+    "보령": (36.3334, 126.6128), "서산": (36.7848, 126.4503), "논산": (36.1872, 127.0987),
+    # 전라
+    "전주": (35.8242, 127.1480), "익산": (35.9483, 126.9577), "군산": (35.9676, 126.7366),
+    "정읍": (35.5699, 126.8559), "남원": (35.4164, 127.3904), "목포": (34.8118, 126.3922),
+    "여수": (34.7604, 127.6622), "순천": (34.9507, 127.4872), "광양": (34.9407, 127.6959),
+    "나주": (35.0160, 126.7108),
+    # 경상
+    "포항": (36.0190, 129.3435), "경주": (35.8562, 129.2247), "구미": (36.1195, 128.3446),
+    "안동": (36.5684, 128.7294), "김천": (36.1398, 128.1136), "영주": (36.8057, 128.6240),
+    "상주": (36.4109, 128.1590), "경산": (35.8251, 128.7415), "창원": (35.2281, 128.6811),
+    "김해": (35.2285, 128.8894), "진주": (35.1800, 128.1076), "양산": (35.3350, 129.0372),
+    "거제": (34.8806, 128.6211), "통영": (34.8544, 128.4331), "사천": (35.0036, 128.0642),
+    "밀양": (35.5038, 128.7467),
+    # 제주
+    "제주": (33.4996, 126.5312), "서귀포": (33.2541, 126.5601),
+}
+
+# 공간 색인의 칸 크기(도). 한 칸은 대략 가로 45km × 세로 55km 입니다.
+CELL_DEGREES = 0.5
+_KM_PER_DEGREE = 111.0
+
+
+def _distance_km(lat1, lon1, lat2, lon2):
+    # 한반도 범위에서는 등장방형 근사로 충분합니다.
+    x = (lon2 - lon1) * math.cos(math.radians((lat1 + lat2) / 2))
+    y = lat2 - lat1
+    return math.hypot(x, y) * _KM_PER_DEGREE
+
+
+class RegionIndex:
+    """지역 좌표를 격자 칸으로 나눠 둔 색인. 가까운 칸부터 넓혀 가며 가장 가까운 지역을 찾습니다."""
+
+    def __init__(self, regions=KOREA_REGIONS, cell_degrees=CELL_DEGREES):
+        self.regions = dict(regions)
+        self.cell_degrees = cell_degrees
+        self._cells = {}
+        for name, (lat, lon) in self.regions.items():
+            self._cells.setdefault(self._cell(lat, lon), []).append(name)
+        rows = [cell[0] for cell in self._cells]
+        cols = [cell[1] for cell in self._cells]
+        self._max_ring = max(max(rows) - min(rows), max(cols) - min(cols)) + 1 if self._cells else 0
+        self._grid = dict(zip(self.regions, latlon_to_grid_many(self.regions.values())))
+
+    def _cell(self, lat, lon):
+        return int(math.floor(lat / self.cell_degrees)), int(math.floor(lon / self.cell_degrees))
+
+    def canonical_name(self, name):
+        """"서울특별시", "수원시" 처럼 접미사가 붙은 이름도 색인의 이름("서울", "수원")으로 바꿉니다. 모르면 None."""
+        name = name.strip()
+        if name in self.regions:
+            return name
+        for suffix in ("특별자치시", "특별자치도", "특별시", "광역시", "시", "군"):
+            if name.endswith(suffix) and name[:-len(suffix)] in self.regions:
+                return name[:-len(suffix)]
+        return None
+
+    def find(self, name):
+        """이름 → (위도, 경도). 모르는 이름이면 None."""
+        canonical = self.canonical_name(name)
+        return self.regions[canonical] if canonical else None
+
+    def grid_of(self, name):
+        """이름 → 기상청 격자 (nx, ny). 같은 지역은 어떻게 적어도 같은 격자입니다. 모르는 이름이면 None."""
+        canonical = self.canonical_name(name)
+        return self._grid[canonical] if canonical else None
+
+    def nearest(self, lat, lon):
+        """(위도, 경도) 에서 가장 가까운 (지역 이름, 거리 km). 색인이 비어 있으면 (None, None)."""
+        row, col = self._cell(lat, lon)
+        best_name, best_km = None, None
+        for ring in range(self._max_ring + 1):
+            # 이번 고리의 가장 가까운 점도 지금까지의 최단 거리보다 멀면 더 볼 필요가 없습니다.
+            if best_km is not None and (ring - 1) * self.cell_degrees * _KM_PER_DEGREE * 0.5 > best_km:
+                break
+            for r in range(row - ring, row + ring + 1):
+                for c in range(col - ring, col + ring + 1):
+                    if max(abs(r - row), abs(c - col)) != ring:
+                        continue
+                    for name in self._cells.get((r, c), ()):
+                        km = _distance_km(lat, lon, *self.regions[name])
+                        if best_km is None or km < best_km:
+                            best_name, best_km = name, km
+        return best_name, best_km
+
+    def nearest_many(self, coords):
+        """[(위도, 경도), ...] → [(지역 이름, 거리 km), ...]"""
+        return [self.nearest(lat, lon) for lat, lon in coords]
+
+
+_default_index = None
+
+
+def get_region_index():
+    global _default_index
+    if _default_index is None:
+        _default_index = RegionIndex()
+    return _default_index
@@ -3,6 +3,11 @@ import json
 from datetime import datetime, timedelta
 import traceback # 상세 오류 로깅용
 import os # os 모듈 추가
+from concurrent.futures import ThreadPoolExecutor
+
+from weather import forecast_cache
+from weather.kma_grid import group_by_grid
+from weather.region_index import get_region_index
 
 # 기상청 API 키 설정
 KMA_API_KEY = os.getenv("KMA_API_KEY")
@@ -17,7 +22,7 @@ if not KMA_API_KEY:
     pass # 시작 시점에 바로 오류를 발생시키지 않도록 수정
 
 
-# 미리 정의된 도시별 X,Y 좌표
+# 미리 정의된 도시별 X,Y 좌표 (기상청이 공개한 격자. 이 도시들은 이름을 어떻게 적어도 이 값을 씁니다)
 CITY_COORDINATES = {
     "서울": {"nx": 60, "ny": 127},
     "부산": {"nx": 98, "ny": 76},
@@ -31,123 +36,202 @@ CITY_COORDINATES = {
     # 필요에 따라 다른 도시 추가
 }
 
-# def get_kma_ultra_srt_fcst_data(service_key, city_name):
-def get_kma_ultra_srt_fcst_data(city_name): # 수정된 함수 정의 (service_key 매개변수 제거)
+ULTRA_SRT_FCST_ENDPOINT = "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtFcst"
+# 여러 도시를 한 번에 조회할 때 동시에 보낼 요청 수
+BATCH_WORKERS = 6
+
+# 초단기 예보는 매시 30분 기준으로 발표되고, 보통 45분쯤부터 API 로 조회할 수 있습니다.
+BASE_TIME_MINUTE = 30
+PUBLICATION_DELAY = timedelta(minutes=15)
+BASE_TIME_INTERVAL = timedelta(hours=1)
+# 최신 발표분이 없어 이전 발표분을 쓴 경우, 이 시간이 지나면 최신 발표분을 다시 시도합니다.
+NO_DATA_RETRY_INTERVAL = timedelta(minutes=5)
+
+SKY_CONDITION_MAP = {"1": "맑음", "3": "구름많음", "4": "흐림"}
+PTY_CONDITION_MAP = {"0": "없음", "1": "비", "2": "비/눈", "3": "눈", "5": "빗방울", "6": "빗방울눈날림", "7": "눈날림"}
+
+
+def resolve_base_datetime(now):
+    """now 시점에 조회할 수 있는 가장 최근 발표 기준시각 (HH:30)."""
+    base_dt = now.replace(minute=BASE_TIME_MINUTE, second=0, microsecond=0)
+    if now < base_dt + PUBLICATION_DELAY:
+        base_dt -= BASE_TIME_INTERVAL
+    return base_dt
+
+
+def next_publication_at(now):
+    """now 이후 다음 발표분을 조회할 수 있게 되는 시각."""
+    return resolve_base_datetime(now) + BASE_TIME_INTERVAL + PUBLICATION_DELAY
+
+
+def parse_forecast_items(items, base_date_str, base_time_str):
     """
-    기상청 초단기 예보 API를 사용하여 특정 도시의 날씨 정보를 가져옵니다.
-    미리 정의된 도시의 X,Y 좌표를 사용하며, KMA_API_KEY 환경 변수에서 API 키를 읽어옵니다.
+    예보 항목 리스트를 한 번만 훑어 시각 × 카테고리 표로 만듭니다.
 
-    :param city_name: 날씨 정보를 조회할 도시 이름 (CITY_COORDINATES에 정의된 이름)
-    :return: 날씨 정보 딕셔너리 또는 에러 메시지 딕셔너리
+    :return: [(fcstDate, fcstTime, {카테고리: 값}), ...] 기준시간 이후의 예보만, 시각 순
+    """
+    table = {}
+    for item in items:
+        fcst_time = item.get("fcstTime")
+        category = item.get("category")
+        if not fcst_time or not category:
+            continue
+        fcst_date = item.get("fcstDate")
+        if not fcst_date:
+            # fcstDate 가 없으면 기준시간보다 이른 시각을 다음 날로 봅니다.
+            fcst_date = base_date_str
+            if int(fcst_time[:2]) < int(base_time_str[:2]):
+                fcst_date = (datetime.strptime(base_date_str, "%Y%m%d") + timedelta(days=1)).strftime("%Y%m%d")
+        table.setdefault((fcst_date, fcst_time), {})[category] = item.get("fcstValue")
+
+    base_key = (base_date_str, base_time_str)
+    return [(d, t, values) for (d, t), values in sorted(table.items()) if (d, t) > base_key]
+
+
+def format_forecast_values(values):
+    """카테고리 값들을 화면용 문자열로 바꿉니다."""
+    hour = {
+        "temperature": "N/A",
+        "humidity": "N/A",
+        "sky_condition": "N/A",
+        "precipitation_form": "N/A",
+        "precipitation_1h": "N/A",
+        "wind_speed": "N/A"
+    }
+    if "T1H" in values: hour["temperature"] = f"{values['T1H']}°C"
+    if "REH" in values: hour["humidity"] = f"{values['REH']}%"
+    if "SKY" in values: hour["sky_condition"] = SKY_CONDITION_MAP.get(values["SKY"], values["SKY"])
+    if "PTY" in values: hour["precipitation_form"] = PTY_CONDITION_MAP.get(values["PTY"], values["PTY"])
+    if "RN1" in values:
+        fcst_val = values["RN1"]
+        if fcst_val == "강수없음": hour["precipitation_1h"] = "강수없음"
+        else:
+            try:
+                val_as_float = float(fcst_val)
+                hour["precipitation_1h"] = f"{fcst_val} mm" if val_as_float != 0 else "0 mm"
+            except ValueError: hour["precipitation_1h"] = fcst_val
+    if "WSD" in values: hour["wind_speed"] = f"{values['WSD']} m/s"
+    return hour
+
+
+def resolve_city_grid(city_name):
+    """
+    도시/지역 이름 → {"nx", "ny"}. "수원", "수원시" 처럼 같은 지역이면 같은 격자입니다. 모르는 이름이면 None.
+    CITY_COORDINATES 에 있는 도시는 (별칭으로 적어도) 공개 격자를 쓰고, 나머지는 지역 색인의 좌표로 계산합니다.
+    """
+    region_index = get_region_index()
+    canonical = region_index.canonical_name(city_name)
+    if canonical is None:
+        return None
+    if canonical in CITY_COORDINATES:
+        return CITY_COORDINATES[canonical]
+    nx, ny = region_index.grid_of(canonical)
+    return {"nx": nx, "ny": ny}
+
+
+def get_kma_ultra_srt_fcst_table(city_name):
+    """
+    기상청 초단기 예보의 모든 예보 시각(보통 6시간)을 표로 가져옵니다.
+
+    :param city_name: 날씨 정보를 조회할 도시 이름 (CITY_COORDINATES 또는 지역 색인에 있는 이름)
+    :return: {"city", "base_date", "base_time", "hours": [시각별 딕셔너리]} 또는 에러 메시지 딕셔너리.
+             시각별 딕셔너리에는 fcst_date, fcst_time, forecast_time, 화면용 값들과 원본 값(values)이 들어 있습니다.
     """
-    
-    current_kma_api_key = os.getenv("KMA_API_KEY")
-    if not current_kma_api_key:
-        return {"error": "KMA_API_KEY 환경변수가 설정되지 않았습니다. 확인 후 다시 시도해주세요."}
     if not city_name:
         return {"error": "도시 이름이 제공되지 않았습니다."}
 
-    coords = CITY_COORDINATES.get(city_name)
+    coords = resolve_city_grid(city_name)
     if not coords:
-        return {"error": f"'{city_name}'에 대한 미리 정의된 X,Y 좌표를 찾을 수 없습니다. 지원되는 도시: {', '.join(CITY_COORDINATES.keys())}"}
+        return {"error": f"'{city_name}'에 대한 X,Y 좌표를 찾을 수 없습니다. 지원되는 도시: {', '.join(CITY_COORDINATES.keys())} 및 주요 시·도"}
+    return get_kma_ultra_srt_fcst_table_at(coords["nx"], coords["ny"], city_name)
+
+
+def get_kma_ultra_srt_fcst_table_at(nx, ny, label=None):
+    """격자 (nx, ny) 의 예보 표. 결과 형식은 get_kma_ultra_srt_fcst_table 과 같습니다."""
+    current_kma_api_key = os.getenv("KMA_API_KEY")
+    if not current_kma_api_key:
+        return {"error": "KMA_API_KEY 환경변수가 설정되지 않았습니다. 확인 후 다시 시도해주세요."}
+    city_name = label or f"격자 {nx},{ny}"
+    coords = {"nx": nx, "ny": ny}
 
     now = datetime.now()
-    base_datetime_candidate = now - timedelta(hours=2)
-    base_date_str = base_datetime_candidate.strftime("%Y%m%d")
-    base_time_str = base_datetime_candidate.strftime("%H30")
-
-    endpoint = "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtFcst"
-    params = {
-        "serviceKey": current_kma_api_key, 
-        "numOfRows": "60",
-        "pageNo": "1",
-        "dataType": "JSON",
-        "base_date": base_date_str,
-        "base_time": base_time_str,
-        "nx": str(coords["nx"]),
-        "ny": str(coords["ny"])
-    }
+    latest_base = resolve_base_datetime(now)
+    # 최신 발표분이 아직 올라오지 않았으면(03) 한 단계 이전 발표분으로 다시 요청합니다.
+    candidates = [latest_base, latest_base - BASE_TIME_INTERVAL]
 
     response = None
     try:
-        response = requests.get(endpoint, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-
-        if data.get("response", {}).get("header", {}).get("resultCode") != "00":
-            header = data.get("response", {}).get("header", {})
-            error_msg = header.get("resultMsg", "API에서 오류 응답")
-            result_code = header.get("resultCode", "N/A")
+        # 캐시는 두 후보를 모두 먼저 확인합니다 (이전 발표분은 최신 발표분이 없었을 때만 남아 있습니다).
+        for base_dt in candidates:
+            base_date_str = base_dt.strftime("%Y%m%d")
+            base_time_str = base_dt.strftime("%H%M")
+            items = forecast_cache.get_forecast(coords["nx"], coords["ny"], base_date_str, base_time_str)
+            if items is not None:
+                break
 
-            if "SERVICE KEY IS NOT REGISTERED" in error_msg.upper() or result_code == "10": 
-                return {"error": "등록되지 않은 서비스 키이거나 서비스 키가 올바르지 않습니다. KMA_API_KEY 환경변수를 확인하세요."}
-            elif result_code == "03": # NO_DATA
-                 return {"error": f"데이터 없음: 기준시간({base_date_str} {base_time_str})에 해당하는 자료가 API 서버에 없습니다."}
-            return {"error": f"API 오류 ({result_code}): {error_msg}"}
+        for attempt, base_dt in enumerate(candidates if items is None else []):
+            base_date_str = base_dt.strftime("%Y%m%d")
+            base_time_str = base_dt.strftime("%H%M")
+            params = {
+                "serviceKey": current_kma_api_key, 
+                "numOfRows": "60",
+                "pageNo": "1",
+                "dataType": "JSON",
+                "base_date": base_date_str,
+                "base_time": base_time_str,
+                "nx": str(coords["nx"]),
+                "ny": str(coords["ny"])
+            }
+            response = requests.get(ULTRA_SRT_FCST_ENDPOINT, params=params, timeout=10)
+            response.raise_for_status()
+            data = response.json()
 
-        items = data.get("response", {}).get("body", {}).get("items", {}).get("item", [])
+            if data.get("response", {}).get("header", {}).get("resultCode") != "00":
+                header = data.get("response", {}).get("header", {})
+                error_msg = header.get("resultMsg", "API에서 오류 응답")
+                result_code = header.get("resultCode", "N/A")
 
-        if not items:
-            return {"error": f"수신된 예보 항목이 없습니다. (기준시간: {base_date_str} {base_time_str})"}
+                if "SERVICE KEY IS NOT REGISTERED" in error_msg.upper() or result_code == "10": 
+                    return {"error": "등록되지 않은 서비스 키이거나 서비스 키가 올바르지 않습니다. KMA_API_KEY 환경변수를 확인하세요."}
+                elif result_code == "03": # NO_DATA
+                    if attempt + 1 < len(candidates):
+                        continue
+                    return {"error": f"데이터 없음: 기준시간({base_date_str} {base_time_str})에 해당하는 자료가 API 서버에 없습니다."}
+                return {"error": f"API 오류 ({result_code}): {error_msg}"}
 
-        weather_info = {
-            "city": f"{city_name} (기준: {base_date_str} {base_time_str[:2]}:{base_time_str[2:]})",
-            "temperature": "N/A",
-            "humidity": "N/A",
-            "sky_condition": "N/A",
-            "precipitation_form": "N/A",
-            "precipitation_1h": "N/A",
-            "wind_speed": "N/A",
-            "forecast_time": "N/A"
-        }
+            items = data.get("response", {}).get("body", {}).get("items", {}).get("item", [])
 
-        available_fcst_times = sorted(list(set(item.get("fcstTime") for item in items if item.get("fcstTime"))))
+            if not items:
+                return {"error": f"수신된 예보 항목이 없습니다. (기준시간: {base_date_str} {base_time_str})"}
+            if base_dt == latest_base:
+                cache_expires_at = next_publication_at(now).timestamp()
+            else:
+                # 이전 발표분으로 대신한 경우에는 잠시 뒤 최신 발표분을 다시 확인합니다.
+                cache_expires_at = (now + NO_DATA_RETRY_INTERVAL).timestamp()
+            forecast_cache.put_forecast(coords["nx"], coords["ny"], base_date_str, base_time_str, items, cache_expires_at)
+            break
 
-        if not available_fcst_times:
-            return {"error": f"API 응답에 유효한 예보 시각(fcstTime) 정보가 없습니다. (기준: {base_date_str} {base_time_str})"}
+        rows = parse_forecast_items(items, base_date_str, base_time_str)
+        if not rows:
+            return {"error": f"기준 시간({base_date_str} {base_time_str}) 이후의 유효한 예보 데이터를 API 응답에서 찾을 수 없습니다."}
 
-        base_dt_obj = datetime.strptime(base_date_str + base_time_str, "%Y%m%d%H%M")
-        target_fcst_time_found = None
+        hours = []
+        for fcst_date, fcst_time, values in rows:
+            hour = format_forecast_values(values)
+            hour.update({
+                "fcst_date": fcst_date,
+                "fcst_time": fcst_time,
+                "forecast_time": f"{fcst_time[:2]}:{fcst_time[2:]} 예보",
+                "values": values
+            })
+            hours.append(hour)
 
-        for fcst_hhmm_str in available_fcst_times:
-            current_fcst_date_obj = datetime.strptime(base_date_str, "%Y%m%d")
-            if int(fcst_hhmm_str[:2]) < base_dt_obj.hour:
-                current_fcst_date_obj += timedelta(days=1)
-            fcst_dt_obj = current_fcst_date_obj.replace(hour=int(fcst_hhmm_str[:2]), minute=int(fcst_hhmm_str[2:]))
-            if fcst_dt_obj > base_dt_obj:
-                target_fcst_time_found = fcst_hhmm_str
-                break
-
-        if not target_fcst_time_found:
-            return {"error": f"기준 시간({base_date_str} {base_time_str}) 이후의 유효한 예보 데이터를 API 응답({available_fcst_times})에서 찾을 수 없습니다."}
-
-        weather_info["forecast_time"] = f"{target_fcst_time_found[:2]}:{target_fcst_time_found[2:]} 예보"
-        sky_condition_map = {"1": "맑음", "3": "구름많음", "4": "흐림"}
-        pty_condition_map = {"0": "없음", "1": "비", "2": "비/눈", "3": "눈", "5": "빗방울", "6": "빗방울눈날림", "7": "눈날림"}
-
-        found_data_for_target_time_at_all = False
-        for item in items:
-            if item.get("fcstTime") == target_fcst_time_found:
-                found_data_for_target_time_at_all = True
-                category = item.get("category")
-                fcst_val = item.get("fcstValue")
-                if category == "T1H": weather_info["temperature"] = f"{fcst_val}°C"
-                elif category == "REH": weather_info["humidity"] = f"{fcst_val}%"
-                elif category == "SKY": weather_info["sky_condition"] = sky_condition_map.get(fcst_val, fcst_val)
-                elif category == "PTY": weather_info["precipitation_form"] = pty_condition_map.get(fcst_val, fcst_val)
-                elif category == "RN1":
-                    if fcst_val == "강수없음": weather_info["precipitation_1h"] = "강수없음"
-                    else:
-                        try:
-                            val_as_float = float(fcst_val)
-                            weather_info["precipitation_1h"] = f"{fcst_val} mm" if val_as_float != 0 else "0 mm"
-                        except ValueError: weather_info["precipitation_1h"] = fcst_val
-                elif category == "WSD": weather_info["wind_speed"] = f"{fcst_val} m/s"
-
-        if not found_data_for_target_time_at_all:
-             return {"error": f"{target_fcst_time_found[:2]}:{target_fcst_time_found[2:]} 시각의 세부 예보 항목을 찾을 수 없습니다."}
-
-        return weather_info
+        return {
+            "city": f"{city_name} (기준: {base_date_str} {base_time_str[:2]}:{base_time_str[2:]})",
+            "base_date": base_date_str,
+            "base_time": base_time_str,
+            "hours": hours
+        }
 
     except requests.exceptions.Timeout:
         return {"error": "날씨 정보 요청 시간 초과"}
@@ -165,6 +249,79 @@ def get_kma_ultra_srt_fcst_data(city_name): # 수정된 함수 정의 (service_k
         tb_str = traceback.format_exc()
         return {"error": f"날씨 정보 처리 중 알 수 없는 오류: {str(e)}\nTraceback:\n{tb_str}"}
 
+
+def get_kma_ultra_srt_fcst_tables(city_names, max_workers=BATCH_WORKERS):
+    """
+    여러 도시의 예보 표를 동시에 가져옵니다.
+
+    :return: {도시 이름: get_kma_ultra_srt_fcst_table 결과} (입력 순서 유지)
+    """
+    city_names = list(city_names)
+    if not city_names:
+        return {}
+    # 같은 격자에 있는 이름(별칭 포함)은 요청 하나를 나눠 씁니다.
+    cells = {name: resolve_city_grid(name) for name in city_names}
+    tables = get_kma_ultra_srt_fcst_tables_at({(c["nx"], c["ny"]) for c in cells.values() if c}, max_workers)
+    results = {}
+    for name, cell in cells.items():
+        if not cell:
+            results[name] = get_kma_ultra_srt_fcst_table(name)  # 찾을 수 없다는 오류 딕셔너리
+            continue
+        table = tables[(cell["nx"], cell["ny"])]
+        results[name] = table if "error" in table else dict(table, city=name)
+    return results
+
+
+def get_kma_ultra_srt_fcst_tables_at(cells, max_workers=BATCH_WORKERS):
+    """
+    격자들의 예보 표를 동시에 가져옵니다. 같은 격자는 한 번만 요청합니다.
+
+    :param cells: (nx, ny) 들의 iterable
+    :return: {(nx, ny): 예보 표}
+    """
+    cells = list(dict.fromkeys(cells))
+    if not cells:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(cells))) as executor:
+        return dict(zip(cells, executor.map(lambda cell: get_kma_ultra_srt_fcst_table_at(*cell), cells)))
+
+
+def get_forecasts_for_locations(coords, max_workers=BATCH_WORKERS):
+    """
+    [(위도, 경도), ...] 각각의 예보 표를 가져옵니다.
+    한 번에 격자로 변환한 뒤 같은 격자에 있는 위치끼리 요청 하나를 나눠 씁니다.
+
+    :return: coords 와 같은 순서의 예보 표 리스트 (같은 격자면 같은 객체)
+    """
+    coords = list(coords)
+    groups = group_by_grid(coords)
+    tables = get_kma_ultra_srt_fcst_tables_at(groups, max_workers)
+    results = [None] * len(coords)
+    for cell, indices in groups.items():
+        for index in indices:
+            results[index] = tables[cell]
+    return results
+
+
+# def get_kma_ultra_srt_fcst_data(service_key, city_name):
+def get_kma_ultra_srt_fcst_data(city_name): # 수정된 함수 정의 (service_key 매개변수 제거)
+    """
+    기상청 초단기 예보 API를 사용하여 특정 도시의 가장 가까운 예보 시각 날씨 정보를 가져옵니다.
+    미리 정의된 도시의 X,Y 좌표를 사용하며, KMA_API_KEY 환경 변수에서 API 키를 읽어옵니다.
+
+    :param city_name: 날씨 정보를 조회할 도시 이름 (CITY_COORDINATES에 정의된 이름)
+    :return: 날씨 정보 딕셔너리 또는 에러 메시지 딕셔너리 (전체 예보 시각은 "hours" 에)
+    """
+    forecast = get_kma_ultra_srt_fcst_table(city_name)
+    if "error" in forecast:
+        return forecast
+
+    first_hour = forecast["hours"][0]
+    weather_info = {key: value for key, value in first_hour.items() if key not in ("fcst_date", "fcst_time", "values")}
+    weather_info["city"] = forecast["city"]
+    weather_info["hours"] = forecast["hours"]
+    return weather_info
+
 if __name__ == '__main__':
     print("기상청 API fetcher 테스트")
     print("="*30)
@@ -192,3 +349,10 @@ if __name__ == '__main__':
                 print(f"  습도: {weather.get('humidity', 'N/A')}")
                 print(f"  1시간 강수량: {weather.get('precipitation_1h', 'N/A')}")
                 print(f"  풍속: {weather.get('wind_speed', 'N/A')}")
+
+        print("\n--- 전체 도시 시간별 예보 ---")
+        for city, forecast in get_kma_ultra_srt_fcst_tables(CITY_COORDINATES).items():
+            if "error" in forecast:
+                print(f"{city}: 오류 - {forecast['error']}")
+            else:
+                print(f"{city}: " + " | ".join(f"{h['fcst_time'][:2]}시 {h['temperature']} {h['sky_condition']}" for h in forecast["hours"]))